@@ -16,6 +16,7 @@ from .models import Note, Issue, Bonus, QualityScore, HookPattern, AnalysisResul
 from .blueprints import BLUEPRINT_PROFILES
 from .helpers import tick_to_bar
 from .analyzers import (
+    AnalysisContext,
     MelodicAnalyzer, VocalAnalyzer, HarmonicAnalyzer,
     RhythmAnalyzer, ArrangementAnalyzer, StructureAnalyzer,
     BonusMelodicAnalyzer, BonusHarmonicAnalyzer,
@@ -38,6 +39,8 @@ class MusicAnalyzer:
         self.issues: List[Issue] = []
         self.profile = BLUEPRINT_PROFILES.get(blueprint) if blueprint is not None else None
         self.metadata = metadata or {}
+        # Sections, columns, extents etc. are derived once for all analyzers.
+        self.context = AnalysisContext()
 
     def analyze_all(self) -> AnalysisResult:
         """Run all analyses and return a complete result.
@@ -50,6 +53,7 @@ class MusicAnalyzer:
             notes_by_channel=self.notes_by_channel,
             profile=self.profile,
             metadata=self.metadata,
+            context=self.context,
         )
 
         analyzers = [
@@ -98,7 +102,7 @@ class MusicAnalyzer:
 
         pitches_by_bar = defaultdict(list)
         for note in vocal_notes:
-            bar = tick_to_bar(note.start)
+            bar = note.start // TICKS_PER_BAR + 1
             pitches_by_bar[bar].append(note.pitch)
 
         bars = sorted(pitches_by_bar.keys())
@@ -143,22 +147,25 @@ class MusicAnalyzer:
         """Calculate energy curve (velocity + density) per bar."""
         energy_curve = []
 
-        max_bar = max((tick_to_bar(n.start) for n in self.notes), default=0)
+        # Notes are sorted by start, so the last one has the latest onset
+        max_bar = tick_to_bar(self.notes[-1].start) if self.notes else 0
+
+        # Bin non-drum note counts and velocity sums by bar in one pass
+        bar_counts = [0] * (max_bar + 1)
+        bar_velocity_sums = [0] * (max_bar + 1)
+        for note in self.notes:
+            if note.channel != 9:
+                bar = note.start // TICKS_PER_BAR + 1
+                bar_counts[bar] += 1
+                bar_velocity_sums[bar] += note.velocity
 
         for bar in range(1, max_bar + 1):
-            bar_start = (bar - 1) * TICKS_PER_BAR
-            bar_end = bar * TICKS_PER_BAR
-
-            bar_notes = [
-                n for n in self.notes
-                if bar_start <= n.start < bar_end and n.channel != 9
-            ]
-            if not bar_notes:
+            density = bar_counts[bar]
+            if not density:
                 energy_curve.append((bar, 0.0))
                 continue
 
-            avg_velocity = sum(n.velocity for n in bar_notes) / len(bar_notes)
-            density = len(bar_notes)
+            avg_velocity = bar_velocity_sums[bar] / density
 
             energy = ((avg_velocity / 127) * 0.6 +
                       min(density / 50, 1.0) * 0.4)
@@ -189,6 +196,7 @@ class MusicAnalyzer:
             metadata=self.metadata,
             hooks=hooks,
             energy_curve=energy_curve,
+            context=self.context,
         )
 
         bonus_analyzers = [
@@ -1,6 +1,6 @@
 """Domain-specific music analyzers."""
 
-from .base import BaseAnalyzer, BaseBonusAnalyzer
+from .base import AnalysisContext, BaseAnalyzer, BaseBonusAnalyzer
 from .melodic import MelodicAnalyzer
 from .vocal import VocalAnalyzer
 from .harmonic import HarmonicAnalyzer
@@ -13,6 +13,7 @@ from .bonus_rhythm import BonusRhythmAnalyzer
 from .bonus_structure import BonusStructureAnalyzer
 
 __all__ = [
+    'AnalysisContext',
     'BaseAnalyzer',
     'BaseBonusAnalyzer',
     'MelodicAnalyzer',
@@ -6,7 +6,11 @@ motif-vocal interference, density balance, rhythm sync compliance,
 and blueprint paradigm conformance.
 """
 
+import heapq
 from collections import defaultdict
+from functools import cached_property
+from itertools import accumulate, combinations
+from operator import sub
 from typing import List
 
 from collections import Counter
@@ -15,11 +19,108 @@ from ..constants import (
     TICKS_PER_BEAT, TICKS_PER_BAR, TRACK_NAMES, GUITAR_CHANNEL,
     Severity, Category,
 )
-from ..helpers import tick_to_bar, note_name, _pattern_similarity, _ioi_entropy
+from ..helpers import (
+    tick_to_bar, note_name, pitch_class_mask, pitch_mask, pitch_median,
+    _pattern_similarity, _cached_pattern_similarity,
+    _ioi_entropy,
+)
 from ..models import Issue
 from .base import BaseAnalyzer
 
 
+# Interval classes (mod 12) treated as motif/vocal clashes: m2, M2, tritone, M7
+_MOTIF_CLASH_MASK = (1 << 1) | (1 << 2) | (1 << 6) | (1 << 11)
+
+# Clash lookup indexed by (motif_pitch - vocal_pitch + 127): folds abs, mod 12
+# and the mask test into one tuple index for any pair of MIDI pitches.
+_MOTIF_CLASH_BY_DIFF = tuple(
+    bool((_MOTIF_CLASH_MASK >> (abs(diff) % 12)) & 1) for diff in range(-127, 128)
+)
+
+
+def _active_notes_per_beat(notes, max_tick: int):
+    """Yield the notes sounding (``start <= tick < end``) at each beat tick.
+
+    Start/end event sweep: notes enter as the start-sorted cursor passes
+    them and leave when a min-heap of end ticks expires them, so each note
+    is added and removed once. The yielded list keeps start order and is
+    the *same object* as on the previous beat whenever membership did not
+    change, letting callers skip re-evaluating unchanged beats.
+    """
+    sounding = {}
+    ends = []
+    active = []
+    next_idx = 0
+    count = len(notes)
+    for tick in range(0, max_tick, TICKS_PER_BEAT):
+        changed = False
+        while next_idx < count and notes[next_idx].start <= tick:
+            note = notes[next_idx]
+            if note.end > tick:
+                sounding[next_idx] = note
+                heapq.heappush(ends, (note.end, next_idx))
+                changed = True
+            next_idx += 1
+        while ends and ends[0][0] <= tick:
+            del sounding[heapq.heappop(ends)[1]]
+            changed = True
+        if changed:
+            active = list(sounding.values())
+        yield active
+
+
+def _max_pitch_per_beat(notes, max_tick: int) -> list:
+    """Highest sounding pitch at each beat tick, or -1 when silent."""
+    return [
+        max(n.pitch for n in active) if active else -1
+        for active in _active_notes_per_beat(notes, max_tick)
+    ]
+
+
+def _pitch_class_roll(notes, max_tick: int) -> list:
+    """Pitch-class mask of the sounding notes at each beat tick (0 if silent).
+
+    A beat-resolution piano roll folded to 12 pitch classes; the mask is
+    only recomputed when the sweep reports a membership change.
+    """
+    roll = []
+    prev_active = None
+    mask = 0
+    for active in _active_notes_per_beat(notes, max_tick):
+        if active is not prev_active:
+            prev_active = active
+            mask = pitch_class_mask(n.pitch for n in active)
+        roll.append(mask)
+    return roll
+
+
+def _bar_contour_signatures(section_notes, start_tick: int) -> list:
+    """Contour-sign tuples of each section bar with at least four notes.
+
+    Notes are bucketed by bar relative to ``start_tick`` (ties ordered by
+    pitch); each bar contributes the signs of its first 16 intervals when
+    that gives at least three.
+    """
+    bars = defaultdict(list)
+    ticks_per_bar = TICKS_PER_BAR
+    for note in sorted(section_notes, key=lambda n: (n.start, n.pitch)):
+        rel_bar = int((note.start - start_tick) // ticks_per_bar)
+        bars[rel_bar].append(note.pitch)
+
+    signatures = []
+    for bar_idx in sorted(bars):
+        pitches = bars[bar_idx]
+        if len(pitches) < 4:
+            continue
+        pitches = pitches[:16]
+        contour = tuple(
+            (delta > 0) - (delta < 0) for delta in map(sub, pitches[1:], pitches)
+        )
+        if len(contour) >= 3:
+            signatures.append(contour)
+    return signatures
+
+
 class ArrangementAnalyzer(BaseAnalyzer):
     """Analyzer for arrangement qualities across all tracks.
 
@@ -29,7 +130,13 @@ class ArrangementAnalyzer(BaseAnalyzer):
     """
 
     def analyze(self) -> List[Issue]:
-        """Run all arrangement analyses and return collected issues."""
+        """Run all arrangement analyses and return collected issues.
+
+        Checks run sequentially on purpose: they are CPU-bound pure Python
+        (threads would serialize on the GIL) and share lazily built,
+        unlocked per-song caches (columns, attack masks, motif features),
+        and issue order must stay deterministic.
+        """
         self._analyze_register_overlap()
         self._analyze_track_separation()
         self._analyze_motif_consistency()
@@ -65,23 +172,24 @@ class ArrangementAnalyzer(BaseAnalyzer):
                 continue
             close_count = 0
             total_checked = 0
-            max_tick = max(n.end for n in self.notes)
-            for tick in range(0, max_tick, TICKS_PER_BEAT):
-                active_a = [n for n in notes_a if n.start <= tick < n.end]
-                active_b = [n for n in notes_b if n.start <= tick < n.end]
+            # The sweep re-yields the same list objects while membership is
+            # unchanged, so runs of identical beats reuse the last verdict.
+            prev_a = prev_b = None
+            is_close = False
+            for active_a, active_b in zip(
+                    _active_notes_per_beat(notes_a, self.max_tick),
+                    _active_notes_per_beat(notes_b, self.max_tick)):
                 if not active_a or not active_b:
                     continue
                 total_checked += 1
-                found_close = False
-                for note_a in active_a:
-                    for note_b in active_b:
-                        if (abs(note_a.pitch - note_b.pitch) <= 3
-                                and abs(note_a.pitch - note_b.pitch) > 0):
-                            found_close = True
-                            break
-                    if found_close:
-                        break
-                if found_close:
+                if active_a is not prev_a or active_b is not prev_b:
+                    prev_a, prev_b = active_a, active_b
+                    # Any pair 1-3 semitones apart: B's pitches shifted by +-1..3
+                    mask_b = pitch_mask(n.pitch for n in active_b)
+                    near_b = ((mask_b << 1) | (mask_b << 2) | (mask_b << 3)
+                              | (mask_b >> 1) | (mask_b >> 2) | (mask_b >> 3))
+                    is_close = bool(pitch_mask(n.pitch for n in active_a) & near_b)
+                if is_close:
                     close_count += 1
             if total_checked > 4:
                 overlap_ratio = close_count / total_checked
@@ -105,8 +213,8 @@ class ArrangementAnalyzer(BaseAnalyzer):
             return
         avg_pitches = {}
         for ch in active_chs:
-            notes = self.notes_by_channel[ch]
-            avg_pitches[ch] = sum(n.pitch for n in notes) / len(notes)
+            pitches = self.columns[ch]['pitch']
+            avg_pitches[ch] = sum(pitches) / len(pitches)
         for idx_a in range(len(active_chs)):
             for idx_b in range(idx_a + 1, len(active_chs)):
                 ch_a, ch_b = active_chs[idx_a], active_chs[idx_b]
@@ -168,16 +276,63 @@ class ArrangementAnalyzer(BaseAnalyzer):
                 'type': sec['type'],
                 'name': sec['type'],
                 'start_bar': sec['start_bar'],
-                'start_tick': (sec['start_bar'] - 1) * TICKS_PER_BAR,
-                'end_tick': sec['end_bar'] * TICKS_PER_BAR,
+                'start_tick': sec['start_tick'],
+                'end_tick': sec['end_tick'],
             }
             for sec in self.sections
         ]
 
+    @cached_property
+    def _motif_section_features(self) -> list:
+        """Motif notes and interval features for each motif section (cached).
+
+        Slices the motif track once per section and derives the contour
+        signs, per-bar contour signatures and 16th-quantized IOIs shared by
+        the consistency, contour and rhythm preservation checks. One entry
+        per ``_motif_sections()`` item.
+        """
+        motif = self.notes_by_channel.get(3, [])
+        motif_cols = self.columns.get(3, {'start': [], 'pitch': []})
+        sixteenth = TICKS_PER_BEAT // 4  # 120 ticks
+        features = []
+        for sec in self._motif_sections():
+            st = sec['start_tick']
+            lo, hi = self.note_index_range(3, st, sec['end_tick'])
+            pitches = motif_cols['pitch'][lo:hi]
+            starts = motif_cols['start'][lo:hi]
+            features.append({
+                'type': sec['type'],
+                'start_bar': sec['start_bar'],
+                'start_tick': st,
+                'notes': motif[lo:hi],
+                'contour': tuple(
+                    (delta > 0) - (delta < 0)
+                    for delta in map(sub, pitches[1:], pitches)
+                ),
+                'ioi': tuple(
+                    round(delta / sixteenth) for delta in map(sub, starts[1:], starts)
+                ),
+                'bar_contours': _bar_contour_signatures(motif[lo:hi], st),
+            })
+        return features
+
+    @cached_property
+    def _motif_sections_by_type(self) -> dict:
+        """Indices into ``_motif_section_features`` grouped by section type (cached).
+
+        Only sections with at least three motif notes are included, in
+        section order.
+        """
+        grouped = defaultdict(list)
+        for sec_idx, sec in enumerate(self._motif_section_features):
+            if len(sec['notes']) >= 3:
+                grouped[sec['type']].append(sec_idx)
+        return dict(grouped)
+
     def _analyze_motif_consistency(self):
         """Check motif pattern similarity across sections."""
         motif = self.notes_by_channel.get(3, [])
-        sections = self._motif_sections()
+        sections = self._motif_section_features
         if len(motif) < 8 or len(sections) < 2:
             return
         min_consistency = (self.profile.motif_consistency_min if self.profile else 0.5)
@@ -185,10 +340,10 @@ class ArrangementAnalyzer(BaseAnalyzer):
         def rhythm_cell(notes):
             cells = []
             by_bar = defaultdict(list)
+            ticks_per_bar = TICKS_PER_BAR
             sixteenth = TICKS_PER_BEAT // 4
             for note in notes:
-                bar = note.start // TICKS_PER_BAR
-                rel = note.start % TICKS_PER_BAR
+                bar, rel = divmod(note.start, ticks_per_bar)
                 by_bar[bar].append(round(rel / sixteenth))
             for bar in sorted(by_bar):
                 if len(by_bar[bar]) >= 2:
@@ -201,38 +356,28 @@ class ArrangementAnalyzer(BaseAnalyzer):
         def chord_pulse_like(notes):
             if len(notes) < 8:
                 return False
-            short = sum(1 for n in notes if n.duration <= TICKS_PER_BEAT // 4) / len(notes)
+            sixteenth = TICKS_PER_BEAT // 4
+            eighth = TICKS_PER_BEAT // 2
+            short = sum(1 for n in notes if n.duration <= sixteenth) / len(notes)
             eighth_grid = sum(
                 1 for n in notes
-                if min(n.start % (TICKS_PER_BEAT // 2),
-                       (TICKS_PER_BEAT // 2) - (n.start % (TICKS_PER_BEAT // 2))) <= 20
+                if min(n.start % eighth, eighth - (n.start % eighth)) <= 20
             ) / len(notes)
             return short >= 0.6 and eighth_grid >= 0.7
 
-        patterns_by_type = defaultdict(list)
-        for sec in sections:
-            st = sec['start_tick']
-            et = sec['end_tick']
-            sec_notes = [n for n in motif if st <= n.start < et]
-            if len(sec_notes) < 3:
-                continue
-            intervals = [
-                1 if sec_notes[idx + 1].pitch > sec_notes[idx].pitch
-                else -1 if sec_notes[idx + 1].pitch < sec_notes[idx].pitch
-                else 0
-                for idx in range(len(sec_notes) - 1)
-            ]
-            patterns_by_type[sec['type']].append({
-                'intervals': intervals,
-                'rhythm_cell': rhythm_cell(sec_notes),
-                'chord_pulse_like': chord_pulse_like(sec_notes),
-                'start_bar': sec['start_bar'],
-                'start_tick': st,
-            })
-
-        for sec_type, entries in patterns_by_type.items():
-            if len(entries) < 2:
+        for sec_type, indices in self._motif_sections_by_type.items():
+            if len(indices) < 2:
                 continue
+            entries = []
+            for sec_idx in indices:
+                sec = sections[sec_idx]
+                entries.append({
+                    'intervals': sec['contour'],
+                    'rhythm_cell': rhythm_cell(sec['notes']),
+                    'chord_pulse_like': chord_pulse_like(sec['notes']),
+                    'start_bar': sec['start_bar'],
+                    'start_tick': sec['start_tick'],
+                })
             reference = entries[0]
             for entry in entries[1:]:
                 sim = _pattern_similarity(reference['intervals'], entry['intervals'])
@@ -274,14 +419,32 @@ class ArrangementAnalyzer(BaseAnalyzer):
             return
         clash_count = 0
         overlap_count = 0
-        for motif_note in motif:
-            for vocal_note in vocal:
-                if motif_note.start < vocal_note.end and motif_note.end > vocal_note.start:
-                    overlap_count += 1
-                    interval = abs(motif_note.pitch - vocal_note.pitch) % 12
-                    if interval in (1, 2, 6, 11):
-                        clash_count += 1
-                    break
+        # Sweep both start-sorted tracks. The heap holds indices of vocal
+        # notes that started before some motif note ended; those that ended
+        # before the current motif note starts can never overlap a later one
+        # either, so they are discarded lazily. The smallest live index is
+        # the first overlapping vocal note in start order, provided it also
+        # starts before this motif note ends (motif ends are not monotonic).
+        # Both tracks are already start-sorted; read plain int columns.
+        vocal_cols = self.columns[0]
+        v_starts, v_ends = vocal_cols['start'], vocal_cols['end']
+        v_pitches = vocal_cols['pitch']
+        motif_cols = self.columns[3]
+        vocal_count = len(v_starts)
+        active = []
+        next_vocal = 0
+        for m_start, m_end, m_pitch in zip(
+                motif_cols['start'], motif_cols['end'], motif_cols['pitch']):
+            while next_vocal < vocal_count and v_starts[next_vocal] < m_end:
+                heapq.heappush(active, next_vocal)
+                next_vocal += 1
+            while active and v_ends[active[0]] <= m_start:
+                heapq.heappop(active)
+            if not active or v_starts[active[0]] >= m_end:
+                continue
+            overlap_count += 1
+            if _MOTIF_CLASH_BY_DIFF[m_pitch - v_pitches[active[0]] + 127]:
+                clash_count += 1
         if overlap_count > 4:
             clash_ratio = clash_count / overlap_count
             if clash_ratio > 0.3:
@@ -383,13 +546,15 @@ class ArrangementAnalyzer(BaseAnalyzer):
         vocal = self.notes_by_channel.get(0, [])
         if len(motif) < 4 or len(vocal) < 4:
             return
-        max_bar = max(tick_to_bar(n.start) for n in self.notes)
+        # Per-bar note counts in one pass per track (bar histogram)
+        ticks_per_bar = TICKS_PER_BAR
+        v_counts = Counter(start // ticks_per_bar for start in self.columns[0]['start'])
+        m_counts = Counter(start // ticks_per_bar for start in self.columns[3]['start'])
         both_dense = 0
         total_both = 0
-        for bar in range(1, max_bar + 1):
-            v_count = sum(1 for n in vocal if tick_to_bar(n.start) == bar)
-            m_count = sum(1 for n in motif if tick_to_bar(n.start) == bar)
-            if v_count > 0 and m_count > 0:
+        for bar, v_count in v_counts.items():
+            m_count = m_counts.get(bar, 0)
+            if m_count > 0:
                 total_both += 1
                 if v_count > 3 and m_count > 3:
                     both_dense += 1
@@ -418,16 +583,10 @@ class ArrangementAnalyzer(BaseAnalyzer):
         if not vocal:
             return
 
-        max_tick = max(n.end for n in self.notes)
+        max_tick = self.max_tick
 
         # Compute vocal median pitch for range encroachment check
-        vocal_pitches = [n.pitch for n in vocal]
-        sorted_pitches = sorted(vocal_pitches)
-        mid_idx = len(sorted_pitches) // 2
-        if len(sorted_pitches) % 2 == 0:
-            vocal_median = (sorted_pitches[mid_idx - 1] + sorted_pitches[mid_idx]) / 2.0
-        else:
-            vocal_median = sorted_pitches[mid_idx]
+        vocal_median = pitch_median(self.columns[0]['pitch'])
 
         # Check each sub-melody track (Aux=ch5, Motif=ch3)
         submelody_configs = [
@@ -447,6 +606,9 @@ class ArrangementAnalyzer(BaseAnalyzer):
             },
         ]
 
+        # Vocal side is shared by every sub-melody track
+        vocal_max_per_beat = _max_pitch_per_beat(vocal, max_tick)
+
         for config in submelody_configs:
             sub_notes = self.notes_by_channel.get(config['channel'], [])
             if not sub_notes:
@@ -455,16 +617,12 @@ class ArrangementAnalyzer(BaseAnalyzer):
             above_count = 0
             overlap_beats = 0
 
-            for tick in range(0, max_tick, TICKS_PER_BEAT):
-                active_vocal = [n for n in vocal if n.start <= tick < n.end]
-                active_sub = [n for n in sub_notes if n.start <= tick < n.end]
-                if not active_vocal or not active_sub:
+            sub_max_per_beat = _max_pitch_per_beat(sub_notes, max_tick)
+            for vocal_max, sub_max in zip(vocal_max_per_beat, sub_max_per_beat):
+                if vocal_max < 0 or sub_max < 0:
                     continue
 
                 overlap_beats += 1
-                vocal_max = max(n.pitch for n in active_vocal)
-                sub_max = max(n.pitch for n in active_sub)
-
                 if sub_max > vocal_max:
                     above_count += 1
 
@@ -508,7 +666,7 @@ class ArrangementAnalyzer(BaseAnalyzer):
 
             # Overall range encroachment check
             if sub_notes:
-                sub_max_pitch = max(n.pitch for n in sub_notes)
+                sub_max_pitch = max(self.columns[config['channel']]['pitch'])
                 if sub_max_pitch >= vocal_median:
                     self.add_issue(
                         severity=Severity.INFO,
@@ -539,7 +697,6 @@ class ArrangementAnalyzer(BaseAnalyzer):
         if not explicit_sections:
             return
 
-        vocal = self.notes_by_channel.get(0, [])
         spotlight_tracks = [
             (3, "Motif"),
             (5, "Aux"),
@@ -557,25 +714,23 @@ class ArrangementAnalyzer(BaseAnalyzer):
             if end_tick <= start_tick:
                 continue
 
-            has_vocal = any(start_tick <= n.start < end_tick for n in vocal)
-            if has_vocal:
+            vocal_lo, vocal_hi = self.note_index_range(0, start_tick, end_tick)
+            if vocal_hi > vocal_lo:
                 continue
 
             bars = max(1.0, (end_tick - start_tick) / TICKS_PER_BAR)
             for channel, name in spotlight_tracks:
-                notes = [
-                    n for n in self.notes_by_channel.get(channel, [])
-                    if start_tick <= n.start < end_tick
-                ]
-                if len(notes) < 4:
+                lo, hi = self.note_index_range(channel, start_tick, end_tick)
+                if hi - lo < 4:
                     continue
+                pitches = self.columns[channel]['pitch'][lo:hi]
 
-                density = len(notes) / bars
-                high_notes = sum(1 for n in notes if n.pitch >= 72)
-                upper_mid_notes = sum(1 for n in notes if n.pitch >= 67)
-                high_ratio = high_notes / len(notes)
-                upper_mid_ratio = upper_mid_notes / len(notes)
-                max_pitch = max(n.pitch for n in notes)
+                density = len(pitches) / bars
+                high_notes = sum(1 for p in pitches if p >= 72)
+                upper_mid_notes = sum(1 for p in pitches if p >= 67)
+                high_ratio = high_notes / len(pitches)
+                upper_mid_ratio = upper_mid_notes / len(pitches)
+                max_pitch = max(pitches)
 
                 spotlight_score = max(high_ratio, upper_mid_ratio * 0.6)
                 if density >= 4.0 and high_ratio >= 0.25:
@@ -621,22 +776,15 @@ class ArrangementAnalyzer(BaseAnalyzer):
         vocal = self.notes_by_channel.get(0, [])
         if len(motif) < 4 or len(vocal) < 4:
             return
-        max_bar = max(tick_to_bar(n.start) for n in self.notes)
+        vocal_masks = self.bar_attack_masks(0)
         sync_bars = 0
         total_bars = 0
-        for bar in range(1, max_bar + 1):
-            m_attacks = set()
-            v_attacks = set()
-            for note in motif:
-                if tick_to_bar(note.start) == bar:
-                    m_attacks.add(note.start % TICKS_PER_BAR)
-            for note in vocal:
-                if tick_to_bar(note.start) == bar:
-                    v_attacks.add(note.start % TICKS_PER_BAR)
-            if m_attacks and v_attacks:
+        for bar, m_attacks in self.bar_attack_masks(3).items():
+            v_attacks = vocal_masks.get(bar, 0)
+            if v_attacks:
                 total_bars += 1
-                overlap = len(m_attacks & v_attacks)
-                union = len(m_attacks | v_attacks)
+                overlap = bin(m_attacks & v_attacks).count("1")
+                union = bin(m_attacks | v_attacks).count("1")
                 if union > 0 and overlap / union > 0.4:
                     sync_bars += 1
         if total_bars > 4:
@@ -662,7 +810,7 @@ class ArrangementAnalyzer(BaseAnalyzer):
         highly consistent. For Free policy, variation is expected.
         """
         motif = self.notes_by_channel.get(3, [])
-        sections = self._motif_sections()
+        sections = self._motif_section_features
         if len(motif) < 8 or len(sections) < 2:
             return
 
@@ -678,102 +826,61 @@ class ArrangementAnalyzer(BaseAnalyzer):
         else:
             min_similarity = 0.3
 
-        def contour_sign(delta):
-            if delta > 0:
-                return 1
-            if delta < 0:
-                return -1
-            return 0
-
-        def bar_contour_signatures(section_notes, start_tick):
-            bars = defaultdict(list)
-            for note in sorted(section_notes, key=lambda n: (n.start, n.pitch)):
-                rel_bar = int((note.start - start_tick) // TICKS_PER_BAR)
-                bars[rel_bar].append(note)
-
-            signatures = []
-            for bar_idx in sorted(bars):
-                bar_notes = bars[bar_idx]
-                if len(bar_notes) < 4:
-                    continue
-                pitches = [note.pitch for note in bar_notes[:16]]
-                contour = [
-                    contour_sign(pitches[idx + 1] - pitches[idx])
-                    for idx in range(len(pitches) - 1)
-                ]
-                if len(contour) >= 3:
-                    signatures.append(contour)
-            return signatures
-
         def signature_similarity(signatures_a, signatures_b):
             if not signatures_a or not signatures_b:
                 return 1.0
             similarities = []
             for sig_b in signatures_b:
                 best = max(
-                    _pattern_similarity(sig_a, sig_b)
+                    _cached_pattern_similarity(sig_a, sig_b)
                     for sig_a in signatures_a
                 )
                 similarities.append(best)
             return sum(similarities) / len(similarities)
 
+        severity = Severity.WARNING
+        if self.profile is not None and self.profile.name == "RhythmLock":
+            severity = Severity.INFO
+
         # Extract per-bar contour cycles per section. RhythmLock motifs are
         # designed as repeated cells; comparing the full section as one long
         # interval stream over-penalizes transposed harmonic cycles.
-        section_contours = {}
-        for sec_idx, sec in enumerate(sections):
-            st = sec['start_tick']
-            et = sec['end_tick']
-            sec_notes = [n for n in motif if st <= n.start < et]
-            if len(sec_notes) < 3:
-                continue
-            signatures = bar_contour_signatures(sec_notes, st)
-            if not signatures:
+        for sec_type, indices in self._motif_sections_by_type.items():
+            if len(indices) < 2:
                 continue
-            section_contours[sec_idx] = {
-                'type': sec['type'],
-                'signatures': signatures,
-                'start_bar': sec['start_bar'],
-                'start_tick': st,
-            }
-
-        # Group sections by type
-        sections_by_type = defaultdict(list)
-        for sec_idx, data in section_contours.items():
-            sections_by_type[data['type']].append(data)
-
-        # Compare same-type sections
-        for sec_type, sec_list in sections_by_type.items():
+            sec_list = []
+            for sec_idx in indices:
+                sec = sections[sec_idx]
+                signatures = sec['bar_contours']
+                if signatures:
+                    sec_list.append({
+                        'signatures': signatures,
+                        'start_bar': sec['start_bar'],
+                        'start_tick': sec['start_tick'],
+                    })
             if len(sec_list) < 2:
                 continue
-            for idx_a in range(len(sec_list)):
-                for idx_b in range(idx_a + 1, len(sec_list)):
-                    sim = signature_similarity(
-                        sec_list[idx_a]['signatures'],
-                        sec_list[idx_b]['signatures'],
+            for sec_a, sec_b in combinations(sec_list, 2):
+                sim = signature_similarity(sec_a['signatures'], sec_b['signatures'])
+                if sim < min_similarity:
+                    self.add_issue(
+                        severity=severity,
+                        category=Category.ARRANGEMENT,
+                        subcategory="motif_contour_preservation",
+                        message=(
+                            f"Motif contour changed between {sec_type} "
+                            f"sections (similarity: {sim:.0%})"
+                        ),
+                        tick=sec_b['start_tick'],
+                        track="Motif",
+                        details={
+                            "similarity": sim,
+                            "threshold": min_similarity,
+                            "section_type": sec_type,
+                            "bar_a": sec_a['start_bar'],
+                            "bar_b": sec_b['start_bar'],
+                        },
                     )
-                    if sim < min_similarity:
-                        severity = Severity.WARNING
-                        if self.profile is not None and self.profile.name == "RhythmLock":
-                            severity = Severity.INFO
-                        self.add_issue(
-                            severity=severity,
-                            category=Category.ARRANGEMENT,
-                            subcategory="motif_contour_preservation",
-                            message=(
-                                f"Motif contour changed between {sec_type} "
-                                f"sections (similarity: {sim:.0%})"
-                            ),
-                            tick=sec_list[idx_b]['start_tick'],
-                            track="Motif",
-                            details={
-                                "similarity": sim,
-                                "threshold": min_similarity,
-                                "section_type": sec_type,
-                                "bar_a": sec_list[idx_a]['start_bar'],
-                                "bar_b": sec_list[idx_b]['start_bar'],
-                            },
-                        )
 
     def _analyze_motif_rhythm_preservation(self):
         """Compare motif IOI patterns across same-type sections.
@@ -782,7 +889,7 @@ class ArrangementAnalyzer(BaseAnalyzer):
         for comparison. Thresholds depend on the riff_policy.
         """
         motif = self.notes_by_channel.get(3, [])
-        sections = self._motif_sections()
+        sections = self._motif_section_features
         if len(motif) < 8 or len(sections) < 2:
             return
 
@@ -798,61 +905,32 @@ class ArrangementAnalyzer(BaseAnalyzer):
         else:
             min_similarity = 0.3
 
-        sixteenth = TICKS_PER_BEAT // 4  # 120 ticks
-
-        # Extract quantized IOI sequences per section
-        section_ioi = {}
-        for sec_idx, sec in enumerate(sections):
-            st = sec['start_tick']
-            et = sec['end_tick']
-            sec_notes = [n for n in motif if st <= n.start < et]
-            if len(sec_notes) < 3:
-                continue
-            ioi_list = [
-                round((sec_notes[idx + 1].start - sec_notes[idx].start) / sixteenth)
-                for idx in range(len(sec_notes) - 1)
-            ]
-            section_ioi[sec_idx] = {
-                'type': sec['type'],
-                'ioi': ioi_list,
-                'start_bar': sec['start_bar'],
-                'start_tick': st,
-            }
-
-        # Group sections by type
-        sections_by_type = defaultdict(list)
-        for sec_idx, data in section_ioi.items():
-            sections_by_type[data['type']].append(data)
-
-        # Compare same-type sections
-        for sec_type, sec_list in sections_by_type.items():
-            if len(sec_list) < 2:
+        # Compare quantized IOI sequences of same-type sections
+        for sec_type, indices in self._motif_sections_by_type.items():
+            if len(indices) < 2:
                 continue
-            for idx_a in range(len(sec_list)):
-                for idx_b in range(idx_a + 1, len(sec_list)):
-                    sim = _pattern_similarity(
-                        sec_list[idx_a]['ioi'],
-                        sec_list[idx_b]['ioi'],
+            sec_list = [sections[sec_idx] for sec_idx in indices]
+            for sec_a, sec_b in combinations(sec_list, 2):
+                sim = _cached_pattern_similarity(sec_a['ioi'], sec_b['ioi'])
+                if sim < min_similarity:
+                    self.add_issue(
+                        severity=Severity.WARNING,
+                        category=Category.ARRANGEMENT,
+                        subcategory="motif_rhythm_preservation",
+                        message=(
+                            f"Motif rhythm changed between {sec_type} "
+                            f"sections (similarity: {sim:.0%})"
+                        ),
+                        tick=sec_b['start_tick'],
+                        track="Motif",
+                        details={
+                            "similarity": sim,
+                            "threshold": min_similarity,
+                            "section_type": sec_type,
+                            "bar_a": sec_a['start_bar'],
+                            "bar_b": sec_b['start_bar'],
+                        },
                     )
-                    if sim < min_similarity:
-                        self.add_issue(
-                            severity=Severity.WARNING,
-                            category=Category.ARRANGEMENT,
-                            subcategory="motif_rhythm_preservation",
-                            message=(
-                                f"Motif rhythm changed between {sec_type} "
-                                f"sections (similarity: {sim:.0%})"
-                            ),
-                            tick=sec_list[idx_b]['start_tick'],
-                            track="Motif",
-                            details={
-                                "similarity": sim,
-                                "threshold": min_similarity,
-                                "section_type": sec_type,
-                                "bar_a": sec_list[idx_a]['start_bar'],
-                                "bar_b": sec_list[idx_b]['start_bar'],
-                            },
-                        )
 
     # -----------------------------------------------------------------
     # Blueprint paradigm
@@ -888,40 +966,31 @@ class ArrangementAnalyzer(BaseAnalyzer):
         if len(active_chs) < 2:
             return
 
-        max_bar = max(tick_to_bar(n.start) for n in self.notes)
+        masks_per_track = [self.bar_attack_masks(ch) for ch in active_chs]
         total_jaccard = 0.0
         bar_count = 0
 
-        for bar in range(1, max_bar + 1):
-            # Collect attack positions for each active track in this bar
-            attacks_per_track = []
-            for ch in active_chs:
-                attacks = set()
-                for note in self.notes_by_channel[ch]:
-                    if tick_to_bar(note.start) == bar:
-                        attacks.add(note.start % TICKS_PER_BAR)
-                attacks_per_track.append(attacks)
+        # Only bars where some track attacks can contribute
+        for bar in sorted(set().union(*masks_per_track)):
+            # Non-empty attack bitmasks of each active track in this bar,
+            # with their popcounts taken once for all pairs
+            non_empty = [
+                (masks[bar], bin(masks[bar]).count("1"))
+                for masks in masks_per_track if bar in masks
+            ]
 
             # Only count bars where at least 2 tracks have attacks
-            non_empty = [att for att in attacks_per_track if att]
             if len(non_empty) < 2:
                 continue
 
-            # Compute pairwise Jaccard and average
-            pair_count = 0
-            pair_jaccard_sum = 0.0
-            for idx_a in range(len(non_empty)):
-                for idx_b in range(idx_a + 1, len(non_empty)):
-                    union = len(non_empty[idx_a] | non_empty[idx_b])
-                    if union == 0:
-                        continue
-                    intersection = len(non_empty[idx_a] & non_empty[idx_b])
-                    pair_jaccard_sum += intersection / union
-                    pair_count += 1
-
-            if pair_count > 0:
-                total_jaccard += pair_jaccard_sum / pair_count
-                bar_count += 1
+            # Average pairwise Jaccard. The union size is |A| + |B| - |A & B|,
+            # never 0 for non-empty masks.
+            pair_jaccards = []
+            for (mask_a, count_a), (mask_b, count_b) in combinations(non_empty, 2):
+                shared = bin(mask_a & mask_b).count("1")
+                pair_jaccards.append(shared / (count_a + count_b - shared))
+            total_jaccard += sum(pair_jaccards) / len(pair_jaccards)
+            bar_count += 1
 
         if bar_count > 0:
             avg_correlation = total_jaccard / bar_count
@@ -954,10 +1023,13 @@ class ArrangementAnalyzer(BaseAnalyzer):
             return
 
         for sec in chorus_sections:
-            st = (sec['start_bar'] - 1) * TICKS_PER_BAR
-            et = sec['end_bar'] * TICKS_PER_BAR
-            vocal_count = sum(1 for n in vocal if st <= n.start < et)
-            motif_count = sum(1 for n in motif if st <= n.start < et)
+            st, et = sec['start_tick'], sec['end_tick']
+            lo, hi = self.note_index_range(3, st, et)
+            motif_count = hi - lo
+            if motif_count < 2:
+                continue  # Cannot exceed a non-empty vocal
+            lo, hi = self.note_index_range(0, st, et)
+            vocal_count = hi - lo
 
             if motif_count > vocal_count and vocal_count > 0:
                 self.add_issue(
@@ -983,7 +1055,7 @@ class ArrangementAnalyzer(BaseAnalyzer):
         if not active_chs:
             return
 
-        max_bar = max(tick_to_bar(n.start) for n in self.notes)
+        max_bar = self.max_bar
         if max_bar == 0:
             return
 
@@ -1028,24 +1100,19 @@ class ArrangementAnalyzer(BaseAnalyzer):
         if not guitar_notes or not chord_notes:
             return
 
-        max_tick = max(n.end for n in self.notes)
+        max_tick = self.max_tick
         identical_count = 0
         total_checked = 0
 
-        for tick in range(0, max_tick, TICKS_PER_BEAT):
-            guitar_active = [
-                n for n in guitar_notes if n.start <= tick < n.end
-            ]
-            chord_active = [
-                n for n in chord_notes if n.start <= tick < n.end
-            ]
-            if not guitar_active or not chord_active:
+        # Compare per-beat pitch-class rolls; a 0 mask means silence
+        for guitar_pcs, chord_pcs in zip(
+            _pitch_class_roll(guitar_notes, max_tick),
+            _pitch_class_roll(chord_notes, max_tick),
+        ):
+            if not guitar_pcs or not chord_pcs:
                 continue
 
             total_checked += 1
-            guitar_pcs = {n.pitch % 12 for n in guitar_active}
-            chord_pcs = {n.pitch % 12 for n in chord_active}
-
             if guitar_pcs == chord_pcs:
                 identical_count += 1
 
@@ -1092,21 +1159,22 @@ class ArrangementAnalyzer(BaseAnalyzer):
 
         verse_vels = []
         chorus_vels = []
+        # Prefix sums: any section's velocity total is one subtraction
+        vel_prefix = [0, *accumulate(self.columns[GUITAR_CHANNEL]['velocity'])]
 
         for sec in self.sections:
-            st = (sec['start_bar'] - 1) * TICKS_PER_BAR
-            et = sec['end_bar'] * TICKS_PER_BAR
-            sec_guitar = [
-                n for n in guitar_notes if st <= n.start < et
-            ]
-            if not sec_guitar:
-                continue
-
-            avg_vel = sum(n.velocity for n in sec_guitar) / len(sec_guitar)
             if sec['type'] == 'verse':
-                verse_vels.append(avg_vel)
+                target = verse_vels
             elif sec['type'] == 'chorus':
-                chorus_vels.append(avg_vel)
+                target = chorus_vels
+            else:
+                continue
+            lo, hi = self.note_index_range(
+                GUITAR_CHANNEL, sec['start_tick'], sec['end_tick'])
+            if hi == lo:
+                continue
+
+            target.append((vel_prefix[hi] - vel_prefix[lo]) / (hi - lo))
 
         if not verse_vels or not chorus_vels:
             return
@@ -1148,7 +1216,6 @@ class ArrangementAnalyzer(BaseAnalyzer):
         }
 
         for channel, track_name in rhythm_tracks.items():
-            notes = self.notes_by_channel.get(channel, [])
             for section in explicit_sections:
                 sec_type = section.get('type', '').upper()
                 # Skip intro/outro -- absence is expected
@@ -1161,10 +1228,8 @@ class ArrangementAnalyzer(BaseAnalyzer):
                     continue
 
                 num_bars = max(1, (end_tick - start_tick) / TICKS_PER_BAR)
-                sec_notes = [
-                    n for n in notes if start_tick <= n.start < end_tick
-                ]
-                note_count = len(sec_notes)
+                lo, hi = self.note_index_range(channel, start_tick, end_tick)
+                note_count = hi - lo
                 sec_name = section.get('name', sec_type)
 
                 if note_count == 0 and num_bars >= 4:
@@ -1217,10 +1282,8 @@ class ArrangementAnalyzer(BaseAnalyzer):
                     continue
 
                 num_bars = max(1, (end_tick - start_tick) / TICKS_PER_BAR)
-                sec_notes = [
-                    n for n in notes if start_tick <= n.start < end_tick
-                ]
-                density = len(sec_notes) / num_bars
+                lo, hi = self.note_index_range(channel, start_tick, end_tick)
+                density = (hi - lo) / num_bars
                 sec_name = section.get('name', section.get('type', ''))
 
                 if prev_density is not None and prev_density > 0 and density > 0:
@@ -1273,7 +1336,7 @@ class ArrangementAnalyzer(BaseAnalyzer):
                 continue
 
             track_name = TRACK_NAMES.get(channel, f"Ch{channel}")
-            pitch_counts = Counter(n.pitch for n in notes)
+            pitch_counts = Counter(self.columns[channel]['pitch'])
             total = len(notes)
 
             top3 = pitch_counts.most_common(3)
@@ -1321,7 +1384,7 @@ class ArrangementAnalyzer(BaseAnalyzer):
                 continue
 
             track_name = TRACK_NAMES.get(channel, f"Ch{channel}")
-            velocities = set(n.velocity for n in notes)
+            velocities = set(self.columns[channel]['velocity'])
 
             if len(velocities) == 1:
                 vel = next(iter(velocities))
@@ -1367,7 +1430,7 @@ class ArrangementAnalyzer(BaseAnalyzer):
                 continue
 
             track_name = TRACK_NAMES.get(channel, f"Ch{channel}")
-            avg_vel = sum(n.velocity for n in notes) / len(notes)
+            avg_vel = sum(self.columns[channel]['velocity']) / len(notes)
 
             if avg_vel < 30:
                 self.add_issue(
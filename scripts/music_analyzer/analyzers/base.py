@@ -4,8 +4,10 @@ Provides common initialization, section estimation, beat position helpers,
 and issue creation used by all domain-specific analyzers.
 """
 
-from collections import defaultdict
-from typing import List, Optional
+import heapq
+from bisect import bisect_left
+from functools import cached_property
+from typing import Dict, List, Optional
 
 from ..constants import (
     TICKS_PER_BEAT, TICKS_PER_BAR, TRACK_NAMES,
@@ -17,15 +19,46 @@ from ..blueprints import BlueprintProfile
 from ..helpers import tick_to_bar
 
 
+# Beat strength indexed by 1-based beat number (slot 0 unused).
+_BEAT_STRENGTH_TABLE = (0.4,) + tuple(
+    BEAT_STRENGTH.get(beat, 0.4)
+    for beat in range(1, TICKS_PER_BAR // TICKS_PER_BEAT + 1)
+)
+
+
+class AnalysisContext:
+    """Lazily filled song-level caches shared by analyzers of one song.
+
+    Everything here depends only on the note list, so analyzers built
+    over the same notes can pass one context and derive each value once.
+    Fields stay None (attack_masks empty) until first requested through
+    the corresponding BaseAnalyzer property.
+    """
+
+    def __init__(self):
+        self.sections = None
+        self.columns = None
+        self.max_tick = None
+        self.max_bar = None
+        self.attack_masks = {}  # Memoized per channel
+        self.chord_degree_index = None
+
+
 class BaseAnalyzer:
     """Common base for all domain-specific analyzers.
 
     Attributes:
         notes: All notes sorted by (start, channel).
         notes_by_channel: Notes grouped by MIDI channel.
+        columns: Per-channel start/end/pitch/velocity lists (lazy).
+        bar_attack_masks(ch): Per-bar attack offset bitmasks (memoized).
+        chord_degree_index: Sorted provenance chord-degree onsets (lazy).
+        max_tick: Latest note end tick (lazy).
+        max_bar: Last bar with a note onset (lazy).
         profile: Optional blueprint profile for context-aware analysis.
         metadata: Song metadata (bpm, sections, etc.).
         issues: Collected analysis issues.
+        context: Song-level caches behind the lazy attributes above.
     """
 
     def __init__(
@@ -34,20 +67,111 @@ class BaseAnalyzer:
         notes_by_channel: dict,
         profile: Optional[BlueprintProfile] = None,
         metadata: Optional[dict] = None,
+        context: Optional[AnalysisContext] = None,
     ):
         self.notes = notes
         self.notes_by_channel = notes_by_channel
         self.profile = profile
         self.metadata = metadata or {}
         self.issues: List[Issue] = []
-        self._sections = None  # Lazy computed
+        # Song-level caches, shared when the orchestrator passes one context
+        self.context = context if context is not None else AnalysisContext()
 
     @property
     def sections(self):
-        """Estimated song sections (lazy computed)."""
-        if self._sections is None:
-            self._sections = self._estimate_sections()
-        return self._sections
+        """Estimated song sections (lazy computed).
+
+        Each section dict carries 'start_bar'/'end_bar' and the matching
+        half-open tick window 'start_tick'/'end_tick'.
+        """
+        if self.context.sections is None:
+            self.context.sections = self._estimate_sections()
+        return self.context.sections
+
+    @property
+    def columns(self) -> dict:
+        """Per-channel note fields as parallel lists (lazy computed).
+
+        Maps channel -> {'start', 'end', 'pitch', 'velocity'} lists aligned
+        with ``notes_by_channel[channel]``, so numeric reductions can run
+        over plain ints instead of per-note attribute lookups.
+        """
+        if self.context.columns is None:
+            self.context.columns = {
+                ch: {
+                    'start': [n.start for n in notes],
+                    'end': [n.end for n in notes],
+                    'pitch': [n.pitch for n in notes],
+                    'velocity': [n.velocity for n in notes],
+                }
+                for ch, notes in self.notes_by_channel.items()
+            }
+        return self.context.columns
+
+    def note_index_range(self, channel: int, start_tick: int, end_tick: int) -> tuple:
+        """Return (lo, hi) indices of channel notes starting in [start_tick, end_tick).
+
+        Binary-searches the channel's start column, relying on
+        ``notes_by_channel`` lists being sorted by start tick.
+        """
+        channel_columns = self.columns.get(channel)
+        if channel_columns is None:
+            return 0, 0
+        starts = channel_columns['start']
+        lo = bisect_left(starts, start_tick)
+        hi = bisect_left(starts, end_tick, lo)
+        return lo, hi
+
+    def notes_in_range(self, channel: int, start_tick: int, end_tick: int) -> List[Note]:
+        """Return channel notes starting in [start_tick, end_tick), in start order."""
+        lo, hi = self.note_index_range(channel, start_tick, end_tick)
+        return self.notes_by_channel.get(channel, [])[lo:hi]
+
+    def bar_attack_masks(self, channel: int) -> dict:
+        """Map each 1-indexed bar to a bitmask of the channel's attack offsets.
+
+        Bit ``n`` is set when a note starts ``n`` ticks after the barline, so
+        attack-set intersection and union become integer ``&``/``|`` and
+        their sizes a popcount. Bars without attacks are absent. Built once
+        per channel and shared by every check that compares attacks.
+        """
+        masks = self.context.attack_masks.get(channel)
+        if masks is None:
+            masks = {}
+            ticks_per_bar = TICKS_PER_BAR
+            for start in self.columns.get(channel, {}).get('start', ()):
+                bar_idx, offset = divmod(start, ticks_per_bar)
+                masks[bar_idx + 1] = masks.get(bar_idx + 1, 0) | (1 << offset)
+            self.context.attack_masks[channel] = masks
+        return masks
+
+    @property
+    def max_tick(self) -> int:
+        """Latest note end tick across all tracks (lazy computed, 0 if empty)."""
+        if self.context.max_tick is None:
+            self._compute_extents()
+        return self.context.max_tick
+
+    @property
+    def max_bar(self) -> int:
+        """Last bar (1-indexed) with a note onset (lazy computed, 0 if empty)."""
+        if self.context.max_bar is None:
+            self._compute_extents()
+        return self.context.max_bar
+
+    def _compute_extents(self):
+        """Fill max_tick and max_bar with a single pass over all notes."""
+        max_end = 0
+        max_start = None
+        for note in self.notes:
+            start = note.start
+            end = start + note.duration
+            if end > max_end:
+                max_end = end
+            if max_start is None or start > max_start:
+                max_start = start
+        self.context.max_tick = max_end
+        self.context.max_bar = tick_to_bar(max_start) if max_start is not None else 0
 
     def analyze(self) -> List[Issue]:
         """Run all analyses for this domain. Override in subclasses."""
@@ -55,50 +179,60 @@ class BaseAnalyzer:
 
     def _estimate_sections(self) -> list:
         """Estimate sections as 8-bar groups with type classification."""
-        max_bar = max(
-            (tick_to_bar(n.start) for n in self.notes), default=0
-        ) if self.notes else 0
+        max_bar = self.max_bar
         sections = []
-        vocal = self.notes_by_channel.get(0, [])
+        vocal_cols = self.columns.get(0, {'pitch': [], 'velocity': []})
+        vocal_pitches = vocal_cols['pitch']
+        vocal_velocities = vocal_cols['velocity']
 
         for start_bar in range(1, max_bar + 1, SECTION_LENGTH_BARS):
             end_bar = min(start_bar + SECTION_LENGTH_BARS - 1, max_bar)
             st = (start_bar - 1) * TICKS_PER_BAR
             et = end_bar * TICKS_PER_BAR
-            sec_notes = [n for n in vocal if st <= n.start < et]
-            density = len(sec_notes) / max(1, end_bar - start_bar + 1)
+            # Sections are contiguous, so the slices cover the vocal once
+            lo, hi = self.note_index_range(0, st, et)
+            note_count = hi - lo
+            density = note_count / max(1, end_bar - start_bar + 1)
             avg_p = (
-                sum(n.pitch for n in sec_notes) / len(sec_notes)
-                if sec_notes else 0
+                sum(vocal_pitches[lo:hi]) / note_count
+                if note_count else 0
             )
             avg_v = (
-                sum(n.velocity for n in sec_notes) / len(sec_notes)
-                if sec_notes else 0
+                sum(vocal_velocities[lo:hi]) / note_count
+                if note_count else 0
             )
             sections.append({
                 'start_bar': start_bar,
                 'end_bar': end_bar,
+                'start_tick': st,
+                'end_tick': et,
                 'density': density,
                 'avg_pitch': avg_p,
                 'avg_velocity': avg_v,
-                'note_count': len(sec_notes),
+                'note_count': note_count,
                 'type': 'verse',
             })
 
         if len(sections) >= 3:
-            energies = sorted(
-                range(len(sections)),
-                key=lambda i: (sections[i]['density'] * 0.4 +
-                               sections[i]['avg_velocity'] / 127 * 0.6),
-                reverse=True,
-            )
-            for rank, idx in enumerate(energies):
-                if rank < len(sections) // 3:
-                    sections[idx]['type'] = 'chorus'
-                elif rank >= len(sections) * 2 // 3:
-                    sections[idx]['type'] = 'verse'
-                else:
-                    sections[idx]['type'] = 'bridge'
+            num_sections = len(sections)
+            energies = [
+                sec['density'] * 0.4 + sec['avg_velocity'] / 127 * 0.6
+                for sec in sections
+            ]
+            # Only the top and bottom thirds matter, so select them instead
+            # of ranking everything. Ties keep ranking order: on equal
+            # energy the earlier section ranks higher.
+            def rank_key(idx):
+                return energies[idx], -idx
+
+            chorus_count = num_sections // 3
+            verse_count = num_sections - num_sections * 2 // 3
+            for sec in sections:
+                sec['type'] = 'bridge'
+            for idx in heapq.nsmallest(verse_count, range(num_sections), key=rank_key):
+                sections[idx]['type'] = 'verse'
+            for idx in heapq.nlargest(chorus_count, range(num_sections), key=rank_key):
+                sections[idx]['type'] = 'chorus'
 
         return sections
 
@@ -114,26 +248,46 @@ class BaseAnalyzer:
 
     def get_beat_strength(self, tick: int) -> float:
         """Return beat strength (0.0-1.0) for a tick position."""
-        beat, _ = self.get_beat_position(tick)
-        return BEAT_STRENGTH.get(beat, 0.4)
+        return _BEAT_STRENGTH_TABLE[(tick % TICKS_PER_BAR) // TICKS_PER_BEAT + 1]
 
-    def get_chord_degree_at(self, tick: int) -> int:
+    @property
+    def chord_degree_index(self) -> tuple:
+        """Sorted onset ticks and chord degrees from note provenance (lazy).
+
+        Returns (ticks, degrees) parallel lists with one entry per distinct
+        onset carrying a provenance chord_degree; the first such note in
+        ``notes`` order supplies the degree for its tick.
+        """
+        if self.context.chord_degree_index is None:
+            first_by_tick = {}
+            keep_first = first_by_tick.setdefault
+            for note in self.notes:
+                provenance = note.provenance
+                if provenance and 'chord_degree' in provenance:
+                    keep_first(note.start, provenance['chord_degree'])
+            ticks = sorted(first_by_tick)
+            self.context.chord_degree_index = (ticks, [first_by_tick[t] for t in ticks])
+        return self.context.chord_degree_index
+
+    def get_chord_degree_at(self, tick: int, max_distance: Optional[int] = None) -> int:
         """Get chord degree from provenance data at a tick.
 
-        Searches for the closest note with provenance chord_degree info.
-        Returns -1 if not found.
+        Finds the closest note with provenance chord_degree info by binary
+        search over ``chord_degree_index``; on equal distance the earlier
+        onset wins. With ``max_distance``, only onsets strictly closer than
+        it count. Returns -1 if not found.
         """
-        best_degree = -1
-        best_dist = float('inf')
-        for note in self.notes:
-            if note.provenance and 'chord_degree' in note.provenance:
-                dist = abs(note.start - tick)
-                if dist < best_dist:
-                    best_dist = dist
-                    best_degree = note.provenance['chord_degree']
-                    if dist == 0:
-                        break
-        return best_degree
+        ticks, degrees = self.chord_degree_index
+        idx = bisect_left(ticks, tick)
+        best_idx = -1
+        best_dist = None
+        if idx > 0:
+            best_idx, best_dist = idx - 1, tick - ticks[idx - 1]
+        if idx < len(ticks) and (best_dist is None or ticks[idx] - tick < best_dist):
+            best_idx, best_dist = idx, ticks[idx] - tick
+        if best_idx < 0 or (max_distance is not None and best_dist >= max_distance):
+            return -1
+        return degrees[best_idx]
 
     def add_issue(
         self,
@@ -172,16 +326,36 @@ class BaseBonusAnalyzer(BaseAnalyzer):
         metadata: Optional[dict] = None,
         hooks: Optional[List[HookPattern]] = None,
         energy_curve: Optional[list] = None,
+        context: Optional[AnalysisContext] = None,
     ):
-        super().__init__(notes, notes_by_channel, profile, metadata)
+        super().__init__(notes, notes_by_channel, profile, metadata, context)
         self.hooks = hooks or []
         self.energy_curve = energy_curve or []
         self.bonuses: List[Bonus] = []
+        # Blueprint weight for hook-based bonuses, resolved once (1.0 if no profile).
+        self.hook_bonus_weight = getattr(profile, 'hook_bonus_weight', 1.0)
 
     def analyze(self) -> List[Bonus]:
         """Run bonus analysis. Override in subclasses."""
         raise NotImplementedError
 
+    @cached_property
+    def _section_types(self) -> List[str]:
+        """Section type strings parallel to ``self.sections`` (cached)."""
+        return [section['type'] for section in self.sections]
+
+    @cached_property
+    def _section_indices_by_type(self) -> Dict[str, List[int]]:
+        """Ascending ``self.sections`` indices grouped by section type (cached).
+
+        Lets checks pick out verse or chorus sections without rescanning
+        and comparing every section's type.
+        """
+        indices_by_type: Dict[str, List[int]] = {}
+        for index, section_type in enumerate(self._section_types):
+            indices_by_type.setdefault(section_type, []).append(index)
+        return indices_by_type
+
     def add_bonus(
         self,
         category: Category,
@@ -4,7 +4,8 @@ Awards bonus points for positive harmonic qualities: tension-resolution arcs,
 voice leading smoothness, and harmonic vocabulary richness.
 """
 
-from collections import defaultdict
+from functools import cached_property
+from operator import sub
 from typing import Dict, List, Optional, Tuple
 
 from ..constants import (
@@ -15,7 +16,7 @@ from ..constants import (
     CHORD_FUNCTION_MAP,
 )
 from ..models import Bonus
-from ..helpers import tick_to_bar
+from ..helpers import pitch_class_mask
 from .base import BaseBonusAnalyzer
 
 
@@ -67,6 +68,14 @@ def _tension_value(degree: int) -> Optional[float]:
     return _FUNCTION_TENSION.get(func, 0.0)
 
 
+# Per-degree lookup tables for degrees 0-6 (built once at import); root
+# pitch classes are stored as single bits for mask-based distinct counts.
+_DEGREE_TENSION_TABLE = tuple(_tension_value(d) for d in range(7))
+_DEGREE_ROOT_BIT_TABLE = tuple(
+    1 << DEGREE_TO_ROOT_PC[d] if d in DEGREE_TO_ROOT_PC else 0 for d in range(7)
+)
+
+
 class BonusHarmonicAnalyzer(BaseBonusAnalyzer):
     """Awards bonus points for positive harmonic qualities.
 
@@ -100,6 +109,8 @@ class BonusHarmonicAnalyzer(BaseBonusAnalyzer):
         (a) Tension increase before chorus sections (+2)
         (b) V->I cadence detection at section boundaries (+2)
         (c) Overall tension arc is not flat (+1)
+
+        All three are accumulated in a single pass over the sections.
         """
         max_score = 5.0
         sections = self.sections
@@ -107,25 +118,63 @@ class BonusHarmonicAnalyzer(BaseBonusAnalyzer):
         if len(sections) < 2:
             return
 
-        # Compute average tension per section.
-        section_tensions = []
-        for section in sections:
+        section_types = self._section_types
+        next_types = section_types[1:] + [None]
+
+        verse_tensions = []
+        pre_chorus_tensions = []
+        cadence_count = 0
+        valid_count = 0
+        min_tension = max_tension = 0.0
+        prev_end_degree = -1
+
+        for section, section_type, next_type in zip(
+            sections, section_types, next_types
+        ):
+            # V -> I cadence across the boundary from the previous section:
+            # degree 4 at its last bar, degree 0 at this section's first bar.
+            if (prev_end_degree == 4
+                    and self._bar_onset_degree(section['start_bar']) == 0):
+                cadence_count += 1
+            prev_end_degree = self._bar_onset_degree(section['end_bar'])
+
+            # Average tension per section; None marks sections without data.
             tension = self._compute_section_tension(section)
-            section_tensions.append(tension)
+            if tension is None:
+                continue
+
+            if valid_count == 0:
+                min_tension = max_tension = tension
+            elif tension < min_tension:
+                min_tension = tension
+            elif tension > max_tension:
+                max_tension = tension
+            valid_count += 1
+
+            if section_type == 'verse':
+                verse_tensions.append(tension)
+            # Sections immediately preceding a chorus.
+            if next_type == 'chorus':
+                pre_chorus_tensions.append(tension)
 
-        if not any(val is not None for val in section_tensions):
+        if valid_count == 0:
             return
 
         # (a) Tension increase before chorus: pre-chorus tension > verse tension.
-        pre_chorus_score = self._evaluate_pre_chorus_tension(
-            sections, section_tensions
-        )
+        pre_chorus_score = 0.0
+        if verse_tensions and pre_chorus_tensions:
+            pre_chorus_score = self._evaluate_pre_chorus_tension(
+                sum(verse_tensions) / len(verse_tensions),
+                sum(pre_chorus_tensions) / len(pre_chorus_tensions),
+            )
 
         # (b) V->I cadence detection at section boundaries.
-        cadence_score = self._evaluate_cadences(sections)
+        cadence_score = self._evaluate_cadences(cadence_count)
 
         # (c) Overall tension arc is not flat.
-        arc_score = self._evaluate_tension_arc(section_tensions)
+        arc_score = 0.0
+        if valid_count >= 2:
+            arc_score = self._evaluate_tension_arc(max_tension - min_tension)
 
         raw_score = pre_chorus_score + cadence_score + arc_score
 
@@ -159,12 +208,11 @@ class BonusHarmonicAnalyzer(BaseBonusAnalyzer):
             Average tension value (0.0-1.0) or None if no data.
         """
         tensions = []
-        for bar_num in range(section['start_bar'], section['end_bar'] + 1):
-            # Beat 1 tick for this bar.
-            beat_one_tick = (bar_num - 1) * TICKS_PER_BAR
-            degree = self._get_chord_degree_near_tick(beat_one_tick)
-            if degree >= 0:
-                tension = _tension_value(degree)
+        # Sections lie within bars 1..max_bar, so slice the sampled degrees.
+        bar_degrees = self._bar_onset_degrees[section['start_bar']:section['end_bar'] + 1]
+        for degree in bar_degrees:
+            if 0 <= degree < 7:
+                tension = _DEGREE_TENSION_TABLE[degree]
                 if tension is not None:
                     tensions.append(tension)
 
@@ -175,8 +223,8 @@ class BonusHarmonicAnalyzer(BaseBonusAnalyzer):
     def _get_chord_degree_near_tick(self, tick: int) -> int:
         """Get chord degree from provenance at or near a tick.
 
-        Searches all notes for the closest provenance chord_degree within
-        a half-bar window of the target tick.
+        Looks up the closest provenance chord_degree within a half-bar
+        window of the target tick.
 
         Args:
             tick: Target tick position.
@@ -184,58 +232,44 @@ class BonusHarmonicAnalyzer(BaseBonusAnalyzer):
         Returns:
             Chord degree (0-6) or -1 if not found.
         """
-        best_degree = -1
-        best_dist = TICKS_PER_BAR // 2  # Max search window: half a bar.
-        for note in self.notes:
-            if note.provenance and 'chord_degree' in note.provenance:
-                dist = abs(note.start - tick)
-                if dist < best_dist:
-                    best_dist = dist
-                    best_degree = note.provenance['chord_degree']
-                    if dist == 0:
-                        break
-        return best_degree
+        # Max search window: half a bar.
+        return self.get_chord_degree_at(tick, max_distance=TICKS_PER_BAR // 2)
+
+    @cached_property
+    def _bar_onset_degrees(self) -> list:
+        """Chord degree near beat 1 of every bar, indexed by bar number (cached).
+
+        Index 0 is unused; bars 1..max_bar are sampled once and shared by
+        the section tension, cadence and root variety checks.
+        """
+        return [-1] + [
+            self._get_chord_degree_near_tick((bar_num - 1) * TICKS_PER_BAR)
+            for bar_num in range(1, self.max_bar + 1)
+        ]
+
+    def _bar_onset_degree(self, bar_num: int) -> int:
+        """Chord degree near beat 1 of a bar (1-indexed), or -1 if not found."""
+        degrees = self._bar_onset_degrees
+        if 0 < bar_num < len(degrees):
+            return degrees[bar_num]
+        return self._get_chord_degree_near_tick((bar_num - 1) * TICKS_PER_BAR)
 
     def _evaluate_pre_chorus_tension(
-        self,
-        sections: list,
-        section_tensions: list,
+        self, avg_verse: float, avg_pre_chorus: float
     ) -> float:
         """Evaluate whether tension rises before chorus sections.
 
-        Compares tension of sections immediately preceding chorus sections
-        with the average verse tension. Higher pre-chorus tension earns
-        bonus points.
+        Compares the average tension of sections immediately preceding
+        chorus sections with the average verse tension. Higher pre-chorus
+        tension earns bonus points.
 
         Args:
-            sections: List of section dicts.
-            section_tensions: Parallel list of tension values (or None).
+            avg_verse: Average tension of verse sections.
+            avg_pre_chorus: Average tension of sections before a chorus.
 
         Returns:
             Score in [0.0, 2.0].
         """
-        # Collect verse and pre-chorus tensions.
-        verse_tensions = []
-        pre_chorus_tensions = []
-
-        for idx, section in enumerate(sections):
-            tension = section_tensions[idx]
-            if tension is None:
-                continue
-
-            if section['type'] == 'verse':
-                verse_tensions.append(tension)
-
-            # Check if the next section is a chorus.
-            if idx + 1 < len(sections) and sections[idx + 1]['type'] == 'chorus':
-                pre_chorus_tensions.append(tension)
-
-        if not verse_tensions or not pre_chorus_tensions:
-            return 0.0
-
-        avg_verse = sum(verse_tensions) / len(verse_tensions)
-        avg_pre_chorus = sum(pre_chorus_tensions) / len(pre_chorus_tensions)
-
         # Award points if pre-chorus tension exceeds verse tension.
         if avg_pre_chorus > avg_verse:
             diff = avg_pre_chorus - avg_verse
@@ -244,41 +278,17 @@ class BonusHarmonicAnalyzer(BaseBonusAnalyzer):
 
         return 0.0
 
-    def _evaluate_cadences(self, sections: list) -> float:
-        """Detect V->I cadences at section boundaries.
-
-        Looks for degree 4 (V chord) near the end of one section and
-        degree 0 (I chord) near the start of the next section.
+    def _evaluate_cadences(self, cadence_count: int) -> float:
+        """Score V->I cadences detected at section boundaries.
 
         Args:
-            sections: List of section dicts.
+            cadence_count: Number of boundaries with degree 4 (V chord) near
+                the end of one section and degree 0 (I chord) near the
+                start of the next.
 
         Returns:
             Score in [0.0, 2.0].
         """
-        cadence_count = 0
-        boundary_count = 0
-
-        for idx in range(len(sections) - 1):
-            boundary_count += 1
-
-            # End of current section: last bar, beat 1.
-            end_bar = sections[idx]['end_bar']
-            end_tick = (end_bar - 1) * TICKS_PER_BAR
-            end_degree = self._get_chord_degree_near_tick(end_tick)
-
-            # Start of next section: first bar, beat 1.
-            start_bar = sections[idx + 1]['start_bar']
-            start_tick = (start_bar - 1) * TICKS_PER_BAR
-            start_degree = self._get_chord_degree_near_tick(start_tick)
-
-            # V -> I cadence: degree 4 -> degree 0.
-            if end_degree == 4 and start_degree == 0:
-                cadence_count += 1
-
-        if boundary_count == 0:
-            return 0.0
-
         # At least one cadence earns 1 point, two or more earns full 2 points.
         if cadence_count >= 2:
             return 2.0
@@ -286,29 +296,18 @@ class BonusHarmonicAnalyzer(BaseBonusAnalyzer):
             return 1.0
         return 0.0
 
-    def _evaluate_tension_arc(
-        self, section_tensions: list
-    ) -> float:
+    def _evaluate_tension_arc(self, tension_range: float) -> float:
         """Evaluate whether the overall tension arc is non-flat.
 
         A non-flat tension arc means the song has harmonic movement --
         not all sections have the same tension level.
 
         Args:
-            section_tensions: List of tension values (some may be None).
+            tension_range: Max minus min tension over sections with data.
 
         Returns:
             Score in [0.0, 1.0].
         """
-        valid_tensions = [val for val in section_tensions if val is not None]
-
-        if len(valid_tensions) < 2:
-            return 0.0
-
-        min_tension = min(valid_tensions)
-        max_tension = max(valid_tensions)
-        tension_range = max_tension - min_tension
-
         # Full point for range >= 0.4, scaled below that.
         if tension_range >= 0.4:
             return 1.0
@@ -330,35 +329,34 @@ class BonusHarmonicAnalyzer(BaseBonusAnalyzer):
         max_score = 3.0
         chord_notes = self.notes_by_channel.get(1, [])
 
-        if not chord_notes:
+        if len(chord_notes) < 2:
+            return
+        # Start-sorted: a track confined to one bar has no transitions.
+        if (chord_notes[0].start // TICKS_PER_BAR
+                == chord_notes[-1].start // TICKS_PER_BAR):
             return
 
         # Group chord notes by bar onset (beat 1 of each bar).
-        bar_voicings = self._group_chord_notes_by_bar_onset(chord_notes)
+        bar_voicings = self._chord_bar_voicings
 
         if len(bar_voicings) < 2:
             return
 
         # Calculate average pitch movement per voice across consecutive bars.
-        sorted_bars = sorted(bar_voicings.keys())
+        # Each bar's voicing is sorted once and reused for both transitions
+        # it takes part in.
+        voicings = [sorted(bar_voicings[bar]) for bar in sorted(bar_voicings)]
         total_movement = 0.0
         transition_count = 0
 
-        for idx in range(len(sorted_bars) - 1):
-            bar_a = sorted_bars[idx]
-            bar_b = sorted_bars[idx + 1]
-            pitches_a = sorted(bar_voicings[bar_a])
-            pitches_b = sorted(bar_voicings[bar_b])
-
+        for pitches_a, pitches_b in zip(voicings, voicings[1:]):
             # Match voices by position (lowest to lowest, etc.).
             voice_count = min(len(pitches_a), len(pitches_b))
             if voice_count == 0:
                 continue
 
-            movement = sum(
-                abs(pitches_b[voice_idx] - pitches_a[voice_idx])
-                for voice_idx in range(voice_count)
-            ) / voice_count
+            # zip stops at the shorter voicing, i.e. voice_count pairs
+            movement = sum(map(abs, map(sub, pitches_b, pitches_a))) / voice_count
 
             total_movement += movement
             transition_count += 1
@@ -393,7 +391,7 @@ class BonusHarmonicAnalyzer(BaseBonusAnalyzer):
             )
 
     def _group_chord_notes_by_bar_onset(
-        self, chord_notes
+        self, starts: List[int], pitches: List[int]
     ) -> Dict[int, List[int]]:
         """Group chord note pitches by the bar they fall on at beat 1.
 
@@ -401,23 +399,43 @@ class BonusHarmonicAnalyzer(BaseBonusAnalyzer):
         (within a quarter-beat tolerance).
 
         Args:
-            chord_notes: List of chord track Note objects.
+            starts: Start ticks of the chord track notes, in start order.
+            pitches: Pitches parallel to ``starts``.
 
         Returns:
             Dict mapping bar number to list of pitches at that bar onset.
         """
         tolerance = TICKS_PER_BEAT // 4  # 120 ticks
-        bar_voicings: Dict[int, List[int]] = defaultdict(list)
+        bar_ticks = TICKS_PER_BAR
+        bar_voicings: Dict[int, List[int]] = {}
+        last_bar = None
+        bar_pitches = None
+
+        for start, pitch in zip(starts, pitches):
+            bar_idx, offset = divmod(start, bar_ticks)
+            if offset > tolerance:
+                continue
+            # Same-bar runs (start-sorted input) skip the dict lookup.
+            if bar_idx != last_bar:
+                last_bar = bar_idx
+                bar_pitches = bar_voicings.setdefault(bar_idx + 1, [])
+            bar_pitches.append(pitch)
 
-        for note in chord_notes:
-            bar_num = tick_to_bar(note.start)
-            beat_one_tick = (bar_num - 1) * TICKS_PER_BAR
-            offset = note.start - beat_one_tick
+        return bar_voicings
 
-            if offset <= tolerance:
-                bar_voicings[bar_num].append(note.pitch)
+    @cached_property
+    def _chord_bar_voicings(self) -> Dict[int, List[int]]:
+        """Chord track (channel 1) pitches per bar onset (cached).
 
-        return dict(bar_voicings)
+        Shared by the voice leading and voicing variety checks; reads the
+        channel's start and pitch columns rather than the Note objects.
+        """
+        chord_columns = self.columns.get(1)
+        if chord_columns is None:
+            return {}
+        return self._group_chord_notes_by_bar_onset(
+            chord_columns['start'], chord_columns['pitch']
+        )
 
     # ------------------------------------------------------------------
     # Check 3: Harmonic Variety (max +2)
@@ -460,18 +478,14 @@ class BonusHarmonicAnalyzer(BaseBonusAnalyzer):
         if not self.notes:
             return 0.0
 
-        max_bar = max(tick_to_bar(note.start) for note in self.notes)
-        root_pcs = set()
-
-        for bar_num in range(1, max_bar + 1):
-            beat_one_tick = (bar_num - 1) * TICKS_PER_BAR
-            degree = self._get_chord_degree_near_tick(beat_one_tick)
-            if degree >= 0:
-                root_pc = DEGREE_TO_ROOT_PC.get(degree)
-                if root_pc is not None:
-                    root_pcs.add(root_pc)
+        # Root pitch classes as a 12-bit mask over bars 1..max_bar
+        # (already sampled; max_bar is cached on the base).
+        root_mask = 0
+        for degree in self._bar_onset_degrees[1:]:
+            if 0 <= degree < 7:
+                root_mask |= _DEGREE_ROOT_BIT_TABLE[degree]
 
-        distinct_count = len(root_pcs)
+        distinct_count = bin(root_mask).count("1")
 
         if distinct_count >= _MIN_DISTINCT_ROOTS:
             return 1.0
@@ -482,9 +496,9 @@ class BonusHarmonicAnalyzer(BaseBonusAnalyzer):
     def _evaluate_voicing_variety(self) -> float:
         """Evaluate the number of distinct chord voicing fingerprints.
 
-        A voicing fingerprint is the sorted tuple of pitch classes from
-        chord notes at each bar onset. More distinct voicings means
-        richer harmonic vocabulary.
+        A voicing fingerprint is the set of pitch classes from chord
+        notes at each bar onset, encoded as a 12-bit mask. More distinct
+        voicings means richer harmonic vocabulary.
 
         Returns:
             Score in [0.0, 1.0]. Full point for 6+ distinct voicings.
@@ -493,14 +507,13 @@ class BonusHarmonicAnalyzer(BaseBonusAnalyzer):
         if not chord_notes:
             return 0.0
 
-        bar_voicings = self._group_chord_notes_by_bar_onset(chord_notes)
+        bar_voicings = self._chord_bar_voicings
         fingerprints = set()
 
         for pitches in bar_voicings.values():
             if pitches:
-                # Convert to pitch classes and create sorted fingerprint.
-                pitch_classes = tuple(sorted(set(pitch % 12 for pitch in pitches)))
-                fingerprints.add(pitch_classes)
+                # Pitch-class set as a 12-bit mask (one int per voicing).
+                fingerprints.add(pitch_class_mask(pitches))
 
         distinct_count = len(fingerprints)
 
@@ -520,6 +533,5 @@ class BonusHarmonicAnalyzer(BaseBonusAnalyzer):
         Returns:
             Weight multiplier (1.0 if no profile set).
         """
-        if self.profile and hasattr(self.profile, 'tension_bonus_weight'):
-            return self.profile.tension_bonus_weight
-        return 1.0
+        # getattr on a None profile falls back to the default as well.
+        return getattr(self.profile, 'tension_bonus_weight', 1.0)
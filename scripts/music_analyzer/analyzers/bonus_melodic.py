@@ -4,20 +4,26 @@ Awards bonus points for positive melodic qualities: hook catchiness,
 earworm potential, melodic sequences, and phrase balance.
 """
 
-from collections import defaultdict
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from functools import cached_property
+from operator import attrgetter, sub
 from typing import List, Tuple
 
 from ..constants import TICKS_PER_BAR, TICKS_PER_BEAT, Category
 from ..models import Bonus, HookPattern
 from ..helpers import (
     tick_to_bar,
-    contour_direction_changes,
-    quantize_rhythm,
-    _pattern_similarity,
+    interval_direction_changes,
+    _cached_quantize_rhythm,
+    _cached_pattern_similarity,
 )
 from .base import BaseBonusAnalyzer
 
 
+# Note pitch getter for C-level map() over note lists.
+_GET_PITCH = attrgetter('pitch')
+
 # Minimum number of vocal notes required for meaningful analysis.
 _MIN_VOCAL_NOTES = 8
 
@@ -27,6 +33,11 @@ _PHRASE_GAP_TICKS = TICKS_PER_BEAT  # 1 beat = 480 ticks
 # Pattern matching thresholds.
 _APPROXIMATE_MATCH_SIMILARITY = 0.7
 _HOOK_PATTERN_BARS = (2, 4)
+_HOOK_FULL_REPETITION_MATCHES = 3  # Matches needed for full repetition credit
+
+# Hook rhythm score by number of distinct quantized IOIs (2-4 is ideal);
+# counts above the table fall off linearly from 3 with a 0.2 floor.
+_HOOK_RHYTHM_SCORES = {1: 0.3, 2: 1.0, 3: 1.0, 4: 1.0, 5: 0.7}
 
 # Earworm optimal ranges.
 _EARWORM_EXACT_RATE_LOW = 0.15
@@ -40,16 +51,21 @@ _SEQUENCE_WINDOW_MAX = 8
 _SEQUENCE_MAX_BONUS = 3
 
 
-def _extract_intervals(pitches: List[int]) -> List[int]:
+def _extract_intervals(pitches: List[int]) -> Tuple[int, ...]:
     """Compute consecutive pitch intervals from a pitch list.
 
+    Two pitch patterns with equal interval tuples are the same melody at a
+    different pitch level, so tuple equality is the transposition-invariant
+    exact match, and the tuples double as dict/Counter keys and memoization
+    keys for ``_cached_pattern_similarity``.
+
     Args:
         pitches: List of MIDI pitch values.
 
     Returns:
-        List of signed intervals (pitch[i+1] - pitch[i]).
+        Tuple of signed intervals (pitch[i+1] - pitch[i]).
     """
-    return [pitches[idx + 1] - pitches[idx] for idx in range(len(pitches) - 1)]
+    return tuple(map(sub, pitches[1:], pitches))
 
 
 def _group_notes_by_bar(notes) -> dict:
@@ -61,9 +77,16 @@ def _group_notes_by_bar(notes) -> dict:
     Returns:
         Dict mapping bar number to list of notes in that bar.
     """
-    bars = defaultdict(list)
+    bars = {}
+    last_bar = None
+    bar_notes = None
     for note in notes:
-        bars[note.bar].append(note)
+        # Inline Note.bar; same-bar runs (start-sorted input) skip the lookup.
+        bar_num = note.start // TICKS_PER_BAR + 1
+        if bar_num != last_bar:
+            last_bar = bar_num
+            bar_notes = bars.setdefault(bar_num, [])
+        bar_notes.append(note)
     return bars
 
 
@@ -79,25 +102,6 @@ def _extract_bar_pitch_pattern(notes) -> List[int]:
     return sorted(note.pitch for note in notes)
 
 
-def _intervals_match_transposed(intervals_a: List[int],
-                                intervals_b: List[int]) -> bool:
-    """Check if two interval sequences are identical (transposition-invariant).
-
-    Two pitch patterns with the same interval sequence are the same melody
-    at a different pitch level.
-
-    Args:
-        intervals_a: First interval sequence.
-        intervals_b: Second interval sequence.
-
-    Returns:
-        True if the interval sequences are identical.
-    """
-    if len(intervals_a) != len(intervals_b):
-        return False
-    return intervals_a == intervals_b
-
-
 class BonusMelodicAnalyzer(BaseBonusAnalyzer):
     """Awards bonus points for positive melodic qualities.
 
@@ -111,6 +115,11 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
     def analyze(self) -> List[Bonus]:
         """Run all melodic bonus checks.
 
+        The checks rely on the vocal notes being sorted by start tick, as
+        every ``notes_by_channel`` list is, and never re-sort them: bar and
+        window groupings keep that order and the channel 0 columns line up
+        with it.
+
         Returns:
             List of Bonus objects awarded.
         """
@@ -118,10 +127,10 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
         if len(vocal_notes) < _MIN_VOCAL_NOTES:
             return self.bonuses
 
-        self._score_hook_quality(vocal_notes)
+        self._score_hook_quality()
         self._score_earworm_potential(vocal_notes)
-        self._score_melodic_sequences(vocal_notes)
-        self._score_phrase_balance(vocal_notes)
+        self._score_melodic_sequences()
+        self._score_phrase_balance()
 
         return self.bonuses
 
@@ -129,15 +138,12 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
     # Check 1: Hook Quality (max +6)
     # ------------------------------------------------------------------
 
-    def _score_hook_quality(self, vocal_notes) -> None:
+    def _score_hook_quality(self) -> None:
         """Score hook quality based on contour, rhythm, and repetition.
 
         Extracts 2-bar and 4-bar pitch patterns from the vocal track and
         evaluates contour interest, rhythmic catchiness, and repetition count
         using transposition-invariant (interval-based) matching.
-
-        Args:
-            vocal_notes: Sorted list of vocal Note objects.
         """
         max_score = 6.0
         best_contour = 0.0
@@ -146,56 +152,51 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
 
         # Extract patterns at 2-bar and 4-bar granularity.
         for bar_span in _HOOK_PATTERN_BARS:
-            patterns = self._extract_bar_span_patterns(vocal_notes, bar_span)
+            patterns = self._extract_bar_span_patterns(bar_span)
             if not patterns:
                 continue
+            # Interval sequence of every window, shared by all repetition counts.
+            span_intervals = [
+                _extract_intervals(pitches) for pitches, _ in patterns
+            ]
 
-            for pitches, iois in patterns:
+            for (pitches, iois), intervals in zip(patterns, span_intervals):
                 if len(pitches) < 3:
                     continue
 
                 # Contour interest: direction changes normalized by note count.
-                changes = contour_direction_changes(pitches)
+                changes = interval_direction_changes(intervals)
                 num_notes = len(pitches)
                 # Ratio of direction changes per note transition.
                 contour_ratio = changes / max(1, num_notes - 1)
-                # Sweet spot: 0.3-0.7 changes per note transition.
-                if 0.3 <= contour_ratio <= 0.7:
-                    contour_score = 1.0
-                elif contour_ratio < 0.3:
-                    # Too flat/monotone.
-                    contour_score = contour_ratio / 0.3
-                else:
-                    # Too jagged.
-                    contour_score = max(0.0, 1.0 - (contour_ratio - 0.7) / 0.3)
+                # Sweet spot: 0.3-0.7 changes per note transition, ramping
+                # down below (too flat/monotone) and above (too jagged).
+                contour_score = min(
+                    1.0,
+                    contour_ratio / 0.3,
+                    max(0.0, 1.0 - (contour_ratio - 0.7) / 0.3),
+                )
 
                 # Rhythmic catchiness: number of distinct IOI values.
                 if iois:
-                    quantized = quantize_rhythm(iois)
+                    quantized = _cached_quantize_rhythm(iois)
                     distinct_iois = len(set(quantized))
-                    # 2-4 distinct values is ideal.
-                    if 2 <= distinct_iois <= 4:
-                        rhythm_score = 1.0
-                    elif distinct_iois == 1:
-                        rhythm_score = 0.3
-                    elif distinct_iois == 5:
-                        rhythm_score = 0.7
-                    else:
+                    rhythm_score = _HOOK_RHYTHM_SCORES.get(distinct_iois)
+                    if rhythm_score is None:
                         rhythm_score = max(0.2, 1.0 - abs(distinct_iois - 3) * 0.15)
                 else:
                     rhythm_score = 0.0
 
                 # Repetition: count approximate matches across the track.
-                intervals = _extract_intervals(pitches)
                 match_count = self._count_interval_matches(
-                    intervals, vocal_notes, bar_span
+                    intervals, span_intervals
                 )
 
                 # Also factor in pre-detected hooks if available.
                 hook_matches = self._count_hook_occurrences(pitches)
                 total_matches = max(match_count, hook_matches)
 
-                if total_matches >= 3:
+                if total_matches >= _HOOK_FULL_REPETITION_MATCHES:
                     repetition_score = 1.0
                 elif total_matches == 2:
                     repetition_score = 0.7
@@ -215,7 +216,7 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
         ) * max_score
 
         # Apply blueprint weight if available.
-        weight = self._get_hook_weight()
+        weight = self.hook_bonus_weight
         raw_score *= weight
 
         if raw_score > 0:
@@ -232,50 +233,62 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
             )
 
     def _extract_bar_span_patterns(
-        self, vocal_notes, bar_span: int
-    ) -> List[Tuple[List[int], List[int]]]:
-        """Extract pitch and IOI patterns at a given bar-span granularity.
+        self, bar_span: int
+    ) -> List[Tuple[List[int], Tuple[int, ...]]]:
+        """Extract vocal pitch and IOI patterns at a given bar-span granularity.
+
+        Reads the start-sorted channel 0 columns.
 
         Args:
-            vocal_notes: Sorted list of vocal Note objects.
             bar_span: Number of bars per pattern (e.g., 2 or 4).
 
         Returns:
             List of (pitches, iois) tuples for each bar-span window.
         """
-        if not vocal_notes:
+        vocal_columns = self.columns.get(0)
+        if not vocal_columns or not vocal_columns['start']:
             return []
 
-        max_bar = max(note.bar for note in vocal_notes)
+        # Window k covers bars k * bar_span + 1 onward; its note index range
+        # comes straight from the shared per-bar note offsets.
+        starts = vocal_columns['start']
+        bar_offsets = self._vocal_bar_offsets
+        bar_count = len(bar_offsets) - 1
         patterns = []
 
-        for start_bar in range(1, max_bar + 1, bar_span):
-            end_bar = start_bar + bar_span
-            start_tick = (start_bar - 1) * TICKS_PER_BAR
-            end_tick = (end_bar - 1) * TICKS_PER_BAR
+        for first_bar in range(0, bar_count, bar_span):
+            lo = bar_offsets[first_bar]
+            hi = bar_offsets[min(first_bar + bar_span, bar_count)]
+            if hi - lo >= 2:
+                pitches = vocal_columns['pitch'][lo:hi]
+                span_starts = starts[lo:hi]
+                iois = tuple(map(sub, span_starts[1:], span_starts))
+                patterns.append((pitches, iois))
 
-            span_notes = [
-                note for note in vocal_notes
-                if start_tick <= note.start < end_tick
-            ]
-            if len(span_notes) < 2:
-                continue
+        return patterns
 
-            span_notes.sort(key=lambda note: note.start)
-            pitches = [note.pitch for note in span_notes]
-            iois = [
-                span_notes[idx + 1].start - span_notes[idx].start
-                for idx in range(len(span_notes) - 1)
-            ]
-            patterns.append((pitches, iois))
+    @cached_property
+    def _vocal_bar_offsets(self) -> List[int]:
+        """Index of the first vocal note at or after each bar line (cached).
 
-        return patterns
+        Entry b is for the bar starting at tick b * TICKS_PER_BAR; a final
+        entry holds the note count. Shared by the 2-bar and 4-bar hook
+        windows, which are unions of consecutive bars.
+        """
+        starts = self.columns[0]['start']
+        bar_count = starts[-1] // TICKS_PER_BAR + 1
+        offsets = []
+        lo = 0
+        for bar_idx in range(bar_count):
+            lo = bisect_left(starts, bar_idx * TICKS_PER_BAR, lo)
+            offsets.append(lo)
+        offsets.append(len(starts))
+        return offsets
 
     def _count_interval_matches(
         self,
-        target_intervals: List[int],
-        vocal_notes,
-        bar_span: int,
+        target_intervals: Tuple[int, ...],
+        span_intervals: List[Tuple[int, ...]],
     ) -> int:
         """Count how many bar-span windows have matching interval patterns.
 
@@ -283,28 +296,39 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
 
         Args:
             target_intervals: Interval sequence to search for.
-            vocal_notes: All vocal notes.
-            bar_span: Bar span used for pattern extraction.
+            span_intervals: Interval sequences of all bar-span windows,
+                as extracted once by the caller.
 
         Returns:
-            Number of matching windows (including the original).
+            Number of matching windows (including the original), capped at
+            _HOOK_FULL_REPETITION_MATCHES since more earn no extra credit.
         """
         if not target_intervals:
             return 0
 
-        patterns = self._extract_bar_span_patterns(vocal_notes, bar_span)
+        target_len = len(target_intervals)
         match_count = 0
 
-        for pitches, _ in patterns:
-            if len(pitches) < 2:
+        for candidate_intervals in span_intervals:
+            if not candidate_intervals:
                 continue
-            candidate_intervals = _extract_intervals(pitches)
-            if _intervals_match_transposed(target_intervals, candidate_intervals):
+            if target_intervals == candidate_intervals:
                 match_count += 1
-            elif _pattern_similarity(
-                target_intervals, candidate_intervals
-            ) >= _APPROXIMATE_MATCH_SIMILARITY:
+            else:
+                # The edit distance is at least the length difference, so
+                # skip candidates whose best possible similarity is too low.
+                candidate_len = len(candidate_intervals)
+                length_gap = abs(target_len - candidate_len)
+                if (1.0 - length_gap / max(target_len, candidate_len)
+                        < _APPROXIMATE_MATCH_SIMILARITY):
+                    continue
+                if _cached_pattern_similarity(
+                    target_intervals, candidate_intervals
+                ) < _APPROXIMATE_MATCH_SIMILARITY:
+                    continue
                 match_count += 1
+            if match_count >= _HOOK_FULL_REPETITION_MATCHES:
+                break
 
         return match_count
 
@@ -330,9 +354,9 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
             if not hook.pitches or len(hook.pitches) < 2:
                 continue
             hook_intervals = _extract_intervals(hook.pitches)
-            if _intervals_match_transposed(target_intervals, hook_intervals):
+            if target_intervals == hook_intervals:
                 best_count = max(best_count, len(hook.occurrences))
-            elif _pattern_similarity(
+            elif _cached_pattern_similarity(
                 target_intervals, hook_intervals
             ) >= _APPROXIMATE_MATCH_SIMILARITY:
                 best_count = max(best_count, len(hook.occurrences))
@@ -358,35 +382,47 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
         if len(bars) < 4:
             return
 
-        # Extract bar-level interval patterns for transposition-invariant matching.
-        bar_numbers = sorted(bars.keys())
+        # Extract bar-level interval patterns for transposition-invariant
+        # matching (hashable, so they can be bucketed and memoized). Bars
+        # and their notes are already in start order. Each bar's pitch range
+        # is taken from the same pitch list for the phrase range check.
         bar_patterns = {}
-        for bar_num in bar_numbers:
-            bar_notes = sorted(bars[bar_num], key=lambda note: note.start)
+        bar_ranges = {}
+        for bar_num, bar_notes in bars.items():
             if len(bar_notes) >= 2:
-                bar_patterns[bar_num] = _extract_intervals(
-                    [note.pitch for note in bar_notes]
-                )
+                pitches = list(map(_GET_PITCH, bar_notes))
+                bar_patterns[bar_num] = _extract_intervals(pitches)
+                bar_ranges[bar_num] = max(pitches) - min(pitches)
 
         if len(bar_patterns) < 4:
             return
 
-        pattern_list = list(bar_patterns.values())
-        total_bars = len(pattern_list)
-        exact_matches = 0
-        approx_matches = 0
+        total_bars = len(bar_patterns)
+
+        # Bars with identical interval sequences are exact (transposed)
+        # matches of each other: a bucket of c bars holds c*(c-1)/2 pairs.
+        pattern_counts = Counter(bar_patterns.values())
+        exact_matches = sum(
+            count * (count - 1) // 2 for count in pattern_counts.values()
+        )
 
-        # Compare each pair of bar patterns.
-        for idx_a in range(total_bars):
-            for idx_b in range(idx_a + 1, total_bars):
-                if _intervals_match_transposed(
-                    pattern_list[idx_a], pattern_list[idx_b]
-                ):
-                    exact_matches += 1
-                elif _pattern_similarity(
-                    pattern_list[idx_a], pattern_list[idx_b]
+        # Approximate matches only occur between different buckets; compare
+        # each pair of distinct patterns once and weight by bucket sizes.
+        # Patterns with any exact or approximate partner are remembered for
+        # the phrase range check.
+        approx_matches = 0
+        repeated_patterns = {
+            pattern for pattern, count in pattern_counts.items() if count > 1
+        }
+        distinct = list(pattern_counts.items())
+        for idx_a, (pat_a, count_a) in enumerate(distinct):
+            for pat_b, count_b in distinct[idx_a + 1:]:
+                if _cached_pattern_similarity(
+                    pat_a, pat_b
                 ) >= _APPROXIMATE_MATCH_SIMILARITY:
-                    approx_matches += 1
+                    approx_matches += count_a * count_b
+                    repeated_patterns.add(pat_a)
+                    repeated_patterns.add(pat_b)
 
         total_pairs = total_bars * (total_bars - 1) / 2
         if total_pairs == 0:
@@ -409,7 +445,11 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
         variation_score = min(1.0, approx_rate * 2.0) if approx_rate > 0 else 0.0
 
         # Phrase range analysis on repeated patterns.
-        range_score = self._evaluate_phrase_ranges(bars, bar_patterns)
+        repeated_ranges = [
+            bar_ranges[bar_num] for bar_num, pattern in bar_patterns.items()
+            if pattern in repeated_patterns
+        ]
+        range_score = self._evaluate_phrase_ranges(repeated_ranges)
 
         raw_score = (
             repetition_score * 0.4
@@ -418,7 +458,7 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
         ) * max_score
 
         # Apply blueprint weight if available.
-        weight = self._get_hook_weight()
+        weight = self.hook_bonus_weight
         raw_score *= weight
 
         if raw_score > 0:
@@ -434,46 +474,18 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
                 ),
             )
 
-    def _evaluate_phrase_ranges(self, bars: dict, bar_patterns: dict) -> float:
+    def _evaluate_phrase_ranges(self, ranges: List[int]) -> float:
         """Evaluate pitch range of repeated phrases.
 
         Optimal range for earworm phrases is 5-12 semitones.
 
         Args:
-            bars: Dict mapping bar number to notes.
-            bar_patterns: Dict mapping bar number to interval patterns.
+            ranges: Pitch ranges (max - min) of the bars whose interval
+                pattern has at least one exact or approximate match.
 
         Returns:
             Score in [0.0, 1.0] based on phrase ranges.
         """
-        if not bar_patterns:
-            return 0.0
-
-        # Find bars that have at least one approximate match.
-        pattern_list = list(bar_patterns.items())
-        repeated_bars = set()
-
-        for idx_a in range(len(pattern_list)):
-            for idx_b in range(idx_a + 1, len(pattern_list)):
-                bar_a, pat_a = pattern_list[idx_a]
-                bar_b, pat_b = pattern_list[idx_b]
-                if (_intervals_match_transposed(pat_a, pat_b)
-                        or _pattern_similarity(pat_a, pat_b)
-                        >= _APPROXIMATE_MATCH_SIMILARITY):
-                    repeated_bars.add(bar_a)
-                    repeated_bars.add(bar_b)
-
-        if not repeated_bars:
-            return 0.0
-
-        # Compute pitch range for repeated bars.
-        ranges = []
-        for bar_num in repeated_bars:
-            if bar_num in bars:
-                pitches = [note.pitch for note in bars[bar_num]]
-                if len(pitches) >= 2:
-                    ranges.append(max(pitches) - min(pitches))
-
         if not ranges:
             return 0.0
 
@@ -492,19 +504,19 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
     # Check 3: Melodic Sequences (max +3)
     # ------------------------------------------------------------------
 
-    def _score_melodic_sequences(self, vocal_notes) -> None:
+    def _score_melodic_sequences(self) -> None:
         """Detect melodic sequences: same interval pattern at different pitches.
 
         A melodic sequence is a melodic fragment that repeats at a different
         pitch level, preserving the interval structure. Common in classical
         and pop music as a development technique.
-
-        Args:
-            vocal_notes: Sorted list of vocal Note objects.
         """
         max_score = 3.0
-        sorted_notes = sorted(vocal_notes, key=lambda note: note.start)
-        pitches = [note.pitch for note in sorted_notes]
+        vocal_columns = self.columns.get(0)
+        if not vocal_columns:
+            return
+        # Vocal pitches in start order, from the shared column cache.
+        pitches = vocal_columns['pitch']
 
         if len(pitches) < _SEQUENCE_WINDOW_MIN + 2:
             return
@@ -525,29 +537,32 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
             _SEQUENCE_WINDOW_MIN - 1,
             -1,
         ):
-            for idx_start in range(len(all_intervals) - window_size + 1):
+            # Bucket start positions by their interval window: only positions
+            # in the same bucket can carry the same interval pattern.
+            window_keys = [
+                all_intervals[idx:idx + window_size]
+                for idx in range(len(all_intervals) - window_size + 1)
+            ]
+            buckets = defaultdict(list)
+            for idx, key in enumerate(window_keys):
+                buckets[key].append(idx)
+
+            for idx_start, key in enumerate(window_keys):
                 if idx_start in matched_positions:
                     continue
 
-                target = all_intervals[idx_start:idx_start + window_size]
+                bucket = buckets[key]
+                if len(bucket) < 2:
+                    continue
 
-                # Search for the same interval pattern at a different position,
-                # starting from a different pitch (to exclude exact repeats).
-                for idx_candidate in range(
-                    idx_start + window_size,
-                    len(all_intervals) - window_size + 1,
-                ):
+                # Search for the same interval pattern at a later,
+                # non-overlapping position, starting from a different pitch
+                # (to exclude exact repeats).
+                first = bisect_left(bucket, idx_start + window_size)
+                for idx_candidate in bucket[first:]:
                     if idx_candidate in matched_positions:
                         continue
-
-                    candidate = all_intervals[
-                        idx_candidate:idx_candidate + window_size
-                    ]
-
-                    # Must have the same intervals but start on different pitch.
-                    if (target == candidate
-                            and pitches[idx_start]
-                            != pitches[idx_candidate]):
+                    if pitches[idx_start] != pitches[idx_candidate]:
                         detected_sequences += 1
                         matched_positions.add(idx_start)
                         matched_positions.add(idx_candidate)
@@ -574,18 +589,15 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
     # Check 4: Phrase Balance (max +2)
     # ------------------------------------------------------------------
 
-    def _score_phrase_balance(self, vocal_notes) -> None:
+    def _score_phrase_balance(self) -> None:
         """Score phrase symmetry based on consecutive phrase length ratios.
 
         Detects phrases via gaps >= 1 beat in vocal notes, then compares
         consecutive phrase lengths. Good phrase balance means phrases have
         similar durations (ratio >= 0.5, ideally 0.7-1.0).
-
-        Args:
-            vocal_notes: Sorted list of vocal Note objects.
         """
         max_score = 2.0
-        phrases = self._detect_phrases(vocal_notes)
+        phrases = self._detect_phrases()
 
         if len(phrases) < 2:
             return
@@ -627,56 +639,38 @@ class BonusMelodicAnalyzer(BaseBonusAnalyzer):
                 ),
             )
 
-    def _detect_phrases(self, vocal_notes) -> List[int]:
-        """Detect phrase lengths based on inter-note gaps.
+    def _detect_phrases(self) -> List[int]:
+        """Detect vocal phrase lengths based on inter-note gaps.
 
         A phrase boundary is detected when the gap between consecutive notes
-        is >= 1 beat (480 ticks).
-
-        Args:
-            vocal_notes: List of vocal Note objects.
+        is >= 1 beat (480 ticks). Reads the start-sorted channel 0 columns.
 
         Returns:
             List of phrase lengths in ticks (start of first note to end
             of last note in each phrase).
         """
-        sorted_notes = sorted(vocal_notes, key=lambda note: note.start)
-        if not sorted_notes:
+        vocal_columns = self.columns.get(0)
+        if not vocal_columns or not vocal_columns['start']:
             return []
 
-        phrases = []
-        phrase_start = sorted_notes[0].start
-        phrase_end = sorted_notes[0].end
-
-        for idx in range(1, len(sorted_notes)):
-            gap = sorted_notes[idx].start - sorted_notes[idx - 1].end
-            if gap >= _PHRASE_GAP_TICKS:
-                # End current phrase, start new one.
-                phrase_length = phrase_end - phrase_start
-                if phrase_length > 0:
-                    phrases.append(phrase_length)
-                phrase_start = sorted_notes[idx].start
-                phrase_end = sorted_notes[idx].end
-            else:
-                phrase_end = max(phrase_end, sorted_notes[idx].end)
-
-        # Final phrase.
-        final_length = phrase_end - phrase_start
-        if final_length > 0:
-            phrases.append(final_length)
+        starts = vocal_columns['start']
+        ends = vocal_columns['end']
 
-        return phrases
+        # Phrase boundaries: the first note and every note starting at least
+        # one beat after the previous note ends.
+        boundaries = [0]
+        boundaries.extend(
+            idx for idx, (start, prev_end) in enumerate(zip(starts[1:], ends), 1)
+            if start - prev_end >= _PHRASE_GAP_TICKS
+        )
+        boundaries.append(len(starts))
 
-    # ------------------------------------------------------------------
-    # Shared helpers
-    # ------------------------------------------------------------------
+        # Each phrase spans from its first onset to its latest note end.
+        phrases = []
+        for lo, hi in zip(boundaries, boundaries[1:]):
+            phrase_length = max(ends[lo:hi]) - starts[lo]
+            if phrase_length > 0:
+                phrases.append(phrase_length)
 
-    def _get_hook_weight(self) -> float:
-        """Get the hook bonus weight from the blueprint profile.
+        return phrases
 
-        Returns:
-            Weight multiplier (1.0 if no profile set).
-        """
-        if self.profile and hasattr(self.profile, 'hook_bonus_weight'):
-            return self.profile.hook_bonus_weight
-        return 1.0
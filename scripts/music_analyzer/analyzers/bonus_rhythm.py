@@ -4,7 +4,11 @@ Awards bonus points for positive rhythmic qualities: rhythmic hooks,
 syncopation balance, and section-level rhythm variation.
 """
 
+from bisect import bisect_left
 from collections import Counter
+from functools import cached_property
+from itertools import chain
+from operator import sub
 from typing import List
 
 from ..constants import TICKS_PER_BAR, TICKS_PER_BEAT, Category
@@ -28,6 +32,28 @@ _HOOK_THRESHOLD_LOW = 0.08
 # Beat position tolerance in ticks for syncopation classification.
 _BEAT_TOLERANCE = 60
 
+# Beat positions within a bar: strong = beats 1 and 3, weak = beats 2 and 4.
+_STRONG_BEAT_POSITIONS = (0, TICKS_PER_BEAT * 2)
+_WEAK_BEAT_POSITIONS = (TICKS_PER_BEAT, TICKS_PER_BEAT * 3)
+
+# Onset classes for syncopation counting.
+_STRONG, _WEAK, _OFF_BEAT = 0, 1, 2
+
+
+def _classify_bar_position(pos_in_bar: int) -> int:
+    """Classify a tick offset within a bar as strong, weak, or off-beat."""
+    if any(abs(pos_in_bar - pos) <= _BEAT_TOLERANCE for pos in _STRONG_BEAT_POSITIONS):
+        return _STRONG
+    if any(abs(pos_in_bar - pos) <= _BEAT_TOLERANCE for pos in _WEAK_BEAT_POSITIONS):
+        return _WEAK
+    return _OFF_BEAT
+
+
+# Onset class for every tick offset in a bar (built once at import).
+_BAR_POSITION_CLASS = tuple(
+    _classify_bar_position(pos) for pos in range(TICKS_PER_BAR)
+)
+
 # Syncopation ideal off-beat ratio range.
 _SYNCOPATION_OFF_BEAT_LOW = 0.2
 _SYNCOPATION_OFF_BEAT_HIGH = 0.5
@@ -40,7 +66,7 @@ _DENSITY_RATIO_LOW = 1.2
 _DENSITY_RATIO_HIGH = 2.5
 
 # Melodic channels (excluding drums ch 9 and SE ch 15).
-_MELODIC_CHANNELS = {0, 1, 2, 3, 4, 5}
+_MELODIC_CHANNELS = (0, 1, 2, 3, 4, 5)
 
 
 class BonusRhythmAnalyzer(BaseBonusAnalyzer):
@@ -82,11 +108,9 @@ class BonusRhythmAnalyzer(BaseBonusAnalyzer):
         if len(vocal_notes) < _MIN_VOCAL_NOTES_FOR_HOOKS:
             return
 
-        sorted_notes = sorted(vocal_notes, key=lambda note: note.start)
-        iois = [
-            sorted_notes[idx + 1].start - sorted_notes[idx].start
-            for idx in range(len(sorted_notes) - 1)
-        ]
+        # Onsets come from the start-sorted vocal column, so no re-sort.
+        starts = self.columns[0]['start']
+        iois = list(map(sub, starts[1:], starts))
 
         if not iois:
             return
@@ -131,21 +155,17 @@ class BonusRhythmAnalyzer(BaseBonusAnalyzer):
         Returns:
             Score in [0.0, 1.0] based on repetition frequency.
         """
-        if len(quantized_iois) < window_size:
+        total_windows = len(quantized_iois) - window_size + 1
+        # A pattern needs at least two windows to repeat at all.
+        if total_windows < 2:
             return 0.0
 
-        # Extract all sliding-window patterns as tuples for hashing.
-        patterns = [
-            tuple(quantized_iois[idx:idx + window_size])
-            for idx in range(len(quantized_iois) - window_size + 1)
-        ]
-
-        if not patterns:
-            return 0.0
-
-        counter = Counter(patterns)
-        top_count = counter.most_common(1)[0][1]
-        total_windows = len(patterns)
+        # Count all sliding-window patterns as tuples. Zipping the shifted
+        # sequences builds each window in C without per-window slicing.
+        counter = Counter(zip(*(
+            quantized_iois[offset:] for offset in range(window_size)
+        )))
+        top_count = max(counter.values())
 
         # A single occurrence is never a "hook" -- require at least 2 repeats.
         if top_count < 2:
@@ -174,44 +194,23 @@ class BonusRhythmAnalyzer(BaseBonusAnalyzer):
         based on its position within the bar, then evaluates the ratios.
         """
         max_score = 3.0
-        melodic_notes = self._get_melodic_notes()
-
-        if not melodic_notes:
+        # Classify each melodic onset by table lookup on its bar offset. The
+        # bar length and table are bound to locals for the per-note loop.
+        bar_ticks = TICKS_PER_BAR
+        position_class = _BAR_POSITION_CLASS
+        melodic_starts = self._melodic_starts
+        if not melodic_starts:
             return
 
-        strong_count = 0
-        weak_count = 0
-        off_beat_count = 0
-
-        # Strong beats: beat 1 (pos 0) and beat 3 (pos TICKS_PER_BEAT*2).
-        strong_positions = [0, TICKS_PER_BEAT * 2]
-        # Weak beats: beat 2 (pos TICKS_PER_BEAT) and beat 4 (pos TICKS_PER_BEAT*3).
-        weak_positions = [TICKS_PER_BEAT, TICKS_PER_BEAT * 3]
-
-        for note in melodic_notes:
-            pos_in_bar = note.start % TICKS_PER_BAR
-            classified = False
+        class_counts = Counter([
+            position_class[start % bar_ticks] for start in melodic_starts
+        ])
 
-            for strong_pos in strong_positions:
-                if abs(pos_in_bar - strong_pos) <= _BEAT_TOLERANCE:
-                    strong_count += 1
-                    classified = True
-                    break
-
-            if not classified:
-                for weak_pos in weak_positions:
-                    if abs(pos_in_bar - weak_pos) <= _BEAT_TOLERANCE:
-                        weak_count += 1
-                        classified = True
-                        break
-
-            if not classified:
-                off_beat_count += 1
+        strong_count = class_counts[_STRONG]
+        weak_count = class_counts[_WEAK]
+        off_beat_count = class_counts[_OFF_BEAT]
 
         total_count = strong_count + weak_count + off_beat_count
-        if total_count == 0:
-            return
-
         off_beat_ratio = off_beat_count / total_count
         strong_beat_ratio = strong_count / total_count
         anchored = strong_beat_ratio >= _SYNCOPATION_ANCHOR_MIN
@@ -253,16 +252,17 @@ class BonusRhythmAnalyzer(BaseBonusAnalyzer):
                 ),
             )
 
-    def _get_melodic_notes(self) -> list:
-        """Collect all melodic notes (channels 0-5, excluding drums).
+    @cached_property
+    def _melodic_starts(self) -> List[int]:
+        """Onset ticks of all melodic channels (0-5) merged in order (cached).
 
-        Returns:
-            List of Note objects from melodic channels.
+        Shared by syncopation classification and section density counts.
         """
-        melodic_notes = []
-        for channel in _MELODIC_CHANNELS:
-            melodic_notes.extend(self.notes_by_channel.get(channel, []))
-        return melodic_notes
+        return sorted(chain.from_iterable(
+            self.columns[channel]['start']
+            for channel in _MELODIC_CHANNELS
+            if channel in self.columns
+        ))
 
     # ------------------------------------------------------------------
     # Check 3: Section Rhythm Variation (max +3)
@@ -281,23 +281,20 @@ class BonusRhythmAnalyzer(BaseBonusAnalyzer):
         if not sections:
             return
 
-        # Calculate melodic note density per section.
-        section_densities = []
-        for section in sections:
-            density = self._compute_section_melodic_density(section)
-            section_densities.append({
-                'type': section['type'],
-                'density': density,
-            })
+        # Melodic note density per section.
+        section_densities = self._section_melodic_densities
 
         # Separate verse and chorus densities.
+        indices_by_type = self._section_indices_by_type
         verse_densities = [
-            entry['density'] for entry in section_densities
-            if entry['type'] == 'verse' and entry['density'] > 0
+            section_densities[index]
+            for index in indices_by_type.get('verse', ())
+            if section_densities[index] > 0
         ]
         chorus_densities = [
-            entry['density'] for entry in section_densities
-            if entry['type'] == 'chorus' and entry['density'] > 0
+            section_densities[index]
+            for index in indices_by_type.get('chorus', ())
+            if section_densities[index] > 0
         ]
 
         if verse_densities and chorus_densities:
@@ -314,8 +311,7 @@ class BonusRhythmAnalyzer(BaseBonusAnalyzer):
             # No clear verse/chorus distinction. Award partial credit for
             # any density variation across sections.
             all_densities = [
-                entry['density'] for entry in section_densities
-                if entry['density'] > 0
+                density for density in section_densities if density > 0
             ]
             if len(all_densities) >= 2:
                 min_density = min(all_densities)
@@ -338,29 +334,26 @@ class BonusRhythmAnalyzer(BaseBonusAnalyzer):
                 ),
             )
 
-    def _compute_section_melodic_density(self, section: dict) -> float:
-        """Compute melodic note density for a section (notes per bar).
-
-        Counts all melodic channel notes within the section's bar range
-        and divides by the number of bars.
-
-        Args:
-            section: Section dict with 'start_bar' and 'end_bar'.
+    @cached_property
+    def _section_melodic_densities(self) -> List[float]:
+        """Melodic note density (notes per bar) per section (cached).
 
-        Returns:
-            Notes per bar for all melodic channels in this section.
+        Bisects every section's start and end tick against the merged
+        melodic onsets in one pass; each section's count is the difference
+        of its two edge indices. Parallel to ``self.sections``.
         """
-        start_tick = (section['start_bar'] - 1) * TICKS_PER_BAR
-        end_tick = section['end_bar'] * TICKS_PER_BAR
-        num_bars = max(1, section['end_bar'] - section['start_bar'] + 1)
-
-        note_count = 0
-        for channel in _MELODIC_CHANNELS:
-            for note in self.notes_by_channel.get(channel, []):
-                if start_tick <= note.start < end_tick:
-                    note_count += 1
-
-        return note_count / num_bars
+        sections = self.sections
+        melodic_starts = self._melodic_starts
+        edges = [
+            bisect_left(melodic_starts, tick)
+            for section in sections
+            for tick in (section['start_tick'], section['end_tick'])
+        ]
+        note_counts = map(sub, edges[1::2], edges[0::2])
+        return [
+            note_count / max(1, section['end_bar'] - section['start_bar'] + 1)
+            for note_count, section in zip(note_counts, sections)
+        ]
 
     def _score_density_ratio(self, ratio: float, max_score: float) -> float:
         """Score a verse-to-chorus density ratio.
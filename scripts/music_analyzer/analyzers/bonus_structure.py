@@ -7,7 +7,7 @@ in chorus sections.
 
 from typing import List
 
-from ..constants import TICKS_PER_BAR, Category
+from ..constants import Category
 from ..models import Bonus
 from .base import BaseBonusAnalyzer
 
@@ -76,7 +76,6 @@ class BonusStructureAnalyzer(BaseBonusAnalyzer):
             return
 
         energies = [energy for _, energy in self.energy_curve]
-        bars = [bar for bar, _ in self.energy_curve]
 
         # Find peak position as a fraction of song duration.
         max_energy = max(energies)
@@ -84,11 +83,10 @@ class BonusStructureAnalyzer(BaseBonusAnalyzer):
         peak_idx = energies.index(max_energy)
         peak_position = peak_idx / max(1, total_points - 1) if total_points > 1 else 0.5
 
-        # Divide into three equal parts.
+        # Divide into three equal parts (the last third is not scored).
         third_size = max(1, total_points // 3)
         first_third = energies[:third_size]
         middle_third = energies[third_size:third_size * 2]
-        last_third = energies[third_size * 2:]
 
         avg_first = sum(first_third) / len(first_third) if first_third else 0.0
         avg_middle = sum(middle_third) / len(middle_third) if middle_third else 0.0
@@ -194,8 +192,8 @@ class BonusStructureAnalyzer(BaseBonusAnalyzer):
 
         # Find chorus sections.
         chorus_sections = [
-            section for section in sections
-            if section['type'] == 'chorus'
+            sections[index]
+            for index in self._section_indices_by_type.get('chorus', ())
         ]
 
         # Fall back to densest section if no chorus detected.
@@ -246,22 +244,25 @@ class BonusStructureAnalyzer(BaseBonusAnalyzer):
         Excludes SE channel (15) from the count.
 
         Args:
-            section: Section dict with 'start_bar' and 'end_bar'.
+            section: Section dict with 'start_tick' and 'end_tick'.
 
         Returns:
             Number of distinct active channels in the section.
         """
-        start_tick = (section['start_bar'] - 1) * TICKS_PER_BAR
-        end_tick = section['end_bar'] * TICKS_PER_BAR
-
-        active_channels = set()
-        for note in self.notes:
-            if note.channel == _SE_CHANNEL:
+        start_tick = section['start_tick']
+        end_tick = section['end_tick']
+
+        # A channel is active if bisecting its onsets finds any in the window;
+        # active channels are collected as bits of a 16-bit mask.
+        active_mask = 0
+        for channel in self.notes_by_channel:
+            if channel == _SE_CHANNEL:
                 continue
-            if start_tick <= note.start < end_tick:
-                active_channels.add(note.channel)
+            lo, hi = self.note_index_range(channel, start_tick, end_tick)
+            if hi > lo:
+                active_mask |= 1 << channel
 
-        return len(active_channels)
+        return bin(active_mask).count("1")
 
     def _get_dynamics_weight(self) -> float:
         """Get the dynamics bonus weight from the blueprint profile.
@@ -17,7 +17,7 @@ from ..constants import (
     GUITAR_CHANNEL, GUITAR_BASS_MUD_THRESHOLD, GUITAR_STRUM_MIN_VOICES,
     Severity, Category,
 )
-from ..helpers import note_name, tick_to_bar
+from ..helpers import note_name, tick_to_bar, pitch_class_mask
 from .base import BaseAnalyzer
 
 
@@ -144,8 +144,7 @@ class HarmonicAnalyzer(BaseAnalyzer):
 
         # Get vocal ceiling for comparison
         vocal_notes = self.notes_by_channel.get(0, [])
-        vocal_ceiling = (max((note.pitch for note in vocal_notes), default=84)
-                         if vocal_notes else 84)
+        vocal_ceiling = max(self.columns[0]['pitch']) if vocal_notes else 84
 
         chords_by_time = defaultdict(list)
         for note in chord_notes:
@@ -163,7 +162,7 @@ class HarmonicAnalyzer(BaseAnalyzer):
                 for note in chord_notes
                 if abs(note.start - tick) <= TICKS_PER_BEAT // 2
             }
-            local_pc_count = len({pitch % 12 for pitch in local_pitches})
+            local_pc_count = bin(pitch_class_mask(local_pitches)).count("1")
             arpeggiated_context = (
                 self.profile is not None and
                 self.profile.name == "RhythmLock" and
@@ -380,9 +379,9 @@ class HarmonicAnalyzer(BaseAnalyzer):
                     )
 
         # Empty bars (bars 3 to max-1)
-        max_bar = max((tick_to_bar(note.start) for note in self.notes), default=0)
+        max_bar = self.max_bar
         if max_bar > 4:
-            bass_bars = set(tick_to_bar(note.start) for note in bass_notes)
+            bass_bars = {note.start // TICKS_PER_BAR + 1 for note in bass_notes}
             empty_bars = []
             for bar in range(3, max_bar - 1):
                 if bar not in bass_bars:
@@ -446,7 +445,7 @@ class HarmonicAnalyzer(BaseAnalyzer):
 
         bass_by_bar = defaultdict(list)
         for note in bass_notes:
-            bar = tick_to_bar(note.start)
+            bar = note.start // TICKS_PER_BAR + 1
             bass_by_bar[bar].append(note)
 
         def get_function(root: int) -> str:
@@ -523,7 +522,7 @@ class HarmonicAnalyzer(BaseAnalyzer):
 
         chords_by_bar = defaultdict(list)
         for note in chord_notes:
-            bar = tick_to_bar(note.start)
+            bar = note.start // TICKS_PER_BAR + 1
             chords_by_bar[bar].append(note.pitch % 12)
 
         bars = sorted(chords_by_bar.keys())
@@ -737,16 +736,15 @@ class HarmonicAnalyzer(BaseAnalyzer):
         if len(bass_notes) < 4:
             return
 
-        max_bar = max(tick_to_bar(note.start) for note in bass_notes)
+        max_bar = tick_to_bar(bass_notes[-1].start)  # start-sorted
         window_size = 4
         window_types = []
 
         for window_start in range(1, max_bar + 1, window_size):
             window_end = window_start + window_size - 1
-            window_notes = [
-                note for note in bass_notes
-                if window_start <= tick_to_bar(note.start) <= window_end
-            ]
+            window_notes = self.notes_in_range(
+                2, (window_start - 1) * TICKS_PER_BAR, window_end * TICKS_PER_BAR,
+            )
             if len(window_notes) < 2:
                 continue
 
@@ -924,8 +922,7 @@ class HarmonicAnalyzer(BaseAnalyzer):
 
         # Get vocal ceiling for comparison
         vocal_notes = self.notes_by_channel.get(0, [])
-        vocal_ceiling = (max((note.pitch for note in vocal_notes), default=84)
-                         if vocal_notes else 84)
+        vocal_ceiling = max(self.columns[0]['pitch']) if vocal_notes else 84
 
         # Group notes by onset
         onsets = defaultdict(list)
@@ -10,7 +10,7 @@ from typing import List
 
 from ..constants import (TICKS_PER_BEAT, TICKS_PER_BAR, TRACK_NAMES, GUITAR_CHANNEL,
                          Severity, Category, VOCAL_STYLE_ULTRA_VOCALOID)
-from ..helpers import tick_to_bar, _ioi_entropy
+from ..helpers import _ioi_entropy
 from ..models import Issue
 from .base import BaseAnalyzer
 
@@ -54,8 +54,8 @@ class RhythmAnalyzer(BaseAnalyzer):
         attacks_by_bar_channel = defaultdict(lambda: defaultdict(set))
         for ch in sync_channels:
             for note in self.notes_by_channel.get(ch, []):
-                bar = tick_to_bar(note.start)
-                beat_pos = note.start % TICKS_PER_BAR
+                bar_idx, beat_pos = divmod(note.start, TICKS_PER_BAR)
+                bar = bar_idx + 1
                 attacks_by_bar_channel[bar][ch].add(beat_pos)
 
         for bar in sorted(attacks_by_bar_channel.keys()):
@@ -90,8 +90,7 @@ class RhythmAnalyzer(BaseAnalyzer):
             track_name = TRACK_NAMES.get(ch, f"Ch{ch}")
             notes_per_bar = defaultdict(int)
             for note in notes:
-                bar = tick_to_bar(note.start)
-                notes_per_bar[bar] += 1
+                notes_per_bar[note.start // TICKS_PER_BAR + 1] += 1
             if not notes_per_bar:
                 continue
             avg_density = sum(notes_per_bar.values()) / len(notes_per_bar)
@@ -385,7 +384,7 @@ class RhythmAnalyzer(BaseAnalyzer):
         max_bar = 0
         for ch in melodic_channels:
             for note in self.notes_by_channel.get(ch, []):
-                bar = tick_to_bar(note.start)
+                bar = note.start // TICKS_PER_BAR + 1
                 if bar > max_bar:
                     max_bar = bar
                 pos_in_bar = note.start % TICKS_PER_BAR
@@ -521,8 +520,8 @@ class RhythmAnalyzer(BaseAnalyzer):
         if chorus_start is None:
             for sec in self.sections:
                 if sec.get('type') == 'chorus':
-                    chorus_start = (sec['start_bar'] - 1) * TICKS_PER_BAR
-                    chorus_end = sec['end_bar'] * TICKS_PER_BAR
+                    chorus_start = sec['start_tick']
+                    chorus_end = sec['end_tick']
                     break
 
         if chorus_start is None or chorus_end is None:
@@ -531,10 +530,7 @@ class RhythmAnalyzer(BaseAnalyzer):
         chorus_bars = max(1, (chorus_end - chorus_start) / TICKS_PER_BAR)
 
         # --- Bass (channel 2) drive check ---
-        bass_notes = [
-            note for note in self.notes_by_channel.get(2, [])
-            if chorus_start <= note.start < chorus_end
-        ]
+        bass_notes = self.notes_in_range(2, chorus_start, chorus_end)
         if bass_notes:
             bass_syncopated = sum(
                 1 for note in bass_notes
@@ -584,10 +580,7 @@ class RhythmAnalyzer(BaseAnalyzer):
                 )
 
         # --- Chord (channel 1) drive check ---
-        chord_notes = [
-            note for note in self.notes_by_channel.get(1, [])
-            if chorus_start <= note.start < chorus_end
-        ]
+        chord_notes = self.notes_in_range(1, chorus_start, chorus_end)
         if chord_notes:
             long_notes = sum(
                 1 for note in chord_notes
@@ -613,10 +606,7 @@ class RhythmAnalyzer(BaseAnalyzer):
                 )
 
         # --- Drums (channel 9) kick drive check ---
-        drum_notes = [
-            note for note in self.notes_by_channel.get(9, [])
-            if chorus_start <= note.start < chorus_end
-        ]
+        drum_notes = self.notes_in_range(9, chorus_start, chorus_end)
         if drum_notes:
             kick_notes = [
                 note for note in drum_notes if note.pitch == 36
@@ -735,9 +725,8 @@ class RhythmAnalyzer(BaseAnalyzer):
         total_sections = 0
 
         for sec in self.sections:
-            st = (sec['start_bar'] - 1) * TICKS_PER_BAR
-            et = sec['end_bar'] * TICKS_PER_BAR
-            sec_notes = [n for n in guitar_notes if st <= n.start < et]
+            sec_notes = self.notes_in_range(
+                GUITAR_CHANNEL, sec['start_tick'], sec['end_tick'])
             if len(sec_notes) < 4:
                 continue
 
@@ -754,18 +743,14 @@ class RhythmAnalyzer(BaseAnalyzer):
 
             total_sections += 1
 
-            # Normalize patterns to tuples for comparison
-            pattern_strs = []
-            for bar in sorted(bar_patterns.keys()):
-                pattern_strs.append(tuple(sorted(bar_patterns[bar])))
-
-            # Count most common pattern
-            pattern_counts = defaultdict(int)
-            for pat in pattern_strs:
-                pattern_counts[pat] += 1
+            # Count most common pattern, normalizing each bar to a sorted
+            # tuple as it streams into the Counter (one pattern per bar).
+            pattern_counts = Counter(
+                tuple(sorted(positions)) for positions in bar_patterns.values()
+            )
 
             most_common_count = max(pattern_counts.values())
-            consistency = most_common_count / len(pattern_strs)
+            consistency = most_common_count / len(bar_patterns)
 
             if consistency < 0.3:
                 inconsistent_sections += 1
@@ -971,8 +956,8 @@ class RhythmAnalyzer(BaseAnalyzer):
         # Build per-bar rhythm patterns (quantized attack positions)
         bar_patterns = defaultdict(list)
         for note in bass:
-            bar = tick_to_bar(note.start)
-            pos_in_bar = note.start % TICKS_PER_BAR
+            bar_idx, pos_in_bar = divmod(note.start, TICKS_PER_BAR)
+            bar = bar_idx + 1
             quantized = round(pos_in_bar / sixteenth)
             bar_patterns[bar].append(quantized)
 
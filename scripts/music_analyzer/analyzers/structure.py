@@ -192,17 +192,13 @@ class StructureAnalyzer(BaseAnalyzer):
             if section['type'] != 'chorus':
                 continue
 
-            section_start = (section['start_bar'] - 1) * TICKS_PER_BAR
-            section_end = section['end_bar'] * TICKS_PER_BAR
+            section_start = section['start_tick']
+            section_end = section['end_tick']
             active_count = 0
 
             for channel in melody_channels:
-                notes = self.notes_by_channel.get(channel, [])
-                notes_in_section = [
-                    note for note in notes
-                    if section_start <= note.start < section_end
-                ]
-                if len(notes_in_section) >= 2:
+                lo, hi = self.note_index_range(channel, section_start, section_end)
+                if hi - lo >= 2:
                     active_count += 1
 
             if active_count < 3:
@@ -245,12 +241,11 @@ class StructureAnalyzer(BaseAnalyzer):
                 continue
 
             note_count = 0
-            for channel, notes in self.notes_by_channel.items():
+            for channel in self.notes_by_channel:
                 if channel == 9:
                     continue
-                for note in notes:
-                    if start_tick <= note.start < end_tick:
-                        note_count += 1
+                lo, hi = self.note_index_range(channel, start_tick, end_tick)
+                note_count += hi - lo
 
             num_bars = max(1, (end_tick - start_tick) / TICKS_PER_BAR)
             density = note_count / num_bars
@@ -368,10 +363,8 @@ class StructureAnalyzer(BaseAnalyzer):
                 continue
 
             num_bars = max(1, (end_tick - start_tick) / TICKS_PER_BAR)
-            sec_drums = [
-                n for n in drums if start_tick <= n.start < end_tick
-            ]
-            density = len(sec_drums) / num_bars
+            lo, hi = self.note_index_range(9, start_tick, end_tick)
+            density = (hi - lo) / num_bars
             section_entries.append({
                 'type': sec_type,
                 'name': section.get('name', sec_type),
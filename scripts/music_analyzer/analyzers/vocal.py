@@ -8,7 +8,7 @@ and phrase repetition balance.
 from collections import Counter
 from typing import List
 
-from ..constants import (TICKS_PER_BEAT, TICKS_PER_BAR, Severity, Category,
+from ..constants import (TICKS_PER_BEAT, Severity, Category,
                          VOCAL_STYLE_VOCALOID, VOCAL_STYLE_ULTRA_VOCALOID)
 from ..helpers import note_name, tick_to_bar
 from ..models import Issue
@@ -97,7 +97,7 @@ class VocalAnalyzer(BaseAnalyzer):
         if len(vocal) < 8:
             return
 
-        pitches = sorted(n.pitch for n in vocal)
+        pitches = sorted(self.columns[0]['pitch'])
         q1_val = pitches[len(pitches) // 4]
         median = pitches[len(pitches) // 2]
         q3_val = pitches[3 * len(pitches) // 4]
@@ -458,13 +458,9 @@ class VocalAnalyzer(BaseAnalyzer):
         def _section_pitch_range(sections):
             ranges = []
             for sec in sections:
-                sec_notes = [
-                    n for n in vocal
-                    if (sec['start_bar'] - 1) * TICKS_PER_BAR <= n.start
-                    < sec['end_bar'] * TICKS_PER_BAR
-                ]
-                if len(sec_notes) >= 4:
-                    pitches = [n.pitch for n in sec_notes]
+                lo, hi = self.note_index_range(0, sec['start_tick'], sec['end_tick'])
+                if hi - lo >= 4:
+                    pitches = self.columns[0]['pitch'][lo:hi]
                     ranges.append(max(pitches) - min(pitches))
             return sum(ranges) / len(ranges) if ranges else 0
 
@@ -1,11 +1,13 @@
 """Helper functions for music analysis.
 
-Utility functions for note naming, tick-to-bar conversion,
-edit distance, pattern similarity, and IOI entropy.
+Utility functions for note naming, tick-to-bar conversion, pitch and
+pitch-class masks, pitch median, edit distance, pattern similarity, and IOI entropy.
 """
 
 import math
 from collections import Counter
+from functools import lru_cache
+from operator import ne, sub
 
 from .constants import NOTE_NAMES, TICKS_PER_BAR, TICKS_PER_BEAT
 
@@ -28,11 +30,75 @@ def tick_to_bar_beat(tick: int) -> str:
     return f"bar{bar}:{beat:.3f}"
 
 
+# Pitch-class bit of every MIDI pitch, precomputed once
+_PC_BITS = tuple(1 << (pitch % 12) for pitch in range(128))
+
+
+def pitch_class_mask(pitches) -> int:
+    """Encode the pitch classes of MIDI pitches as a 12-bit mask.
+
+    Bit ``pitch % 12`` is set for every pitch, so pitch-class set equality,
+    intersection and size become ``==``, ``&`` and a popcount on ints.
+    """
+    pc_bits = _PC_BITS
+    mask = 0
+    for pitch in pitches:
+        mask |= pc_bits[pitch]
+    return mask
+
+
+def pitch_mask(pitches) -> int:
+    """Encode a set of MIDI pitches as a 128-bit mask (bit ``pitch`` set).
+
+    Shifting the mask by ``k`` transposes every pitch by ``k`` semitones,
+    so "any pair within N semitones" tests become a few ``|``/``&`` ops.
+    """
+    mask = 0
+    for pitch in pitches:
+        mask |= 1 << pitch
+    return mask
+
+
+def pitch_median(pitches: list) -> float:
+    """Median of MIDI pitch values in linear time.
+
+    MIDI pitches are bounded to 0-127, so the median is selected from a
+    128-bin histogram instead of sorting the whole list. Matches
+    ``statistics.median``: the middle value for odd lengths, the mean of
+    the two middle values for even lengths.
+
+    Args:
+        pitches: Non-empty list of MIDI pitch values (0-127).
+
+    Returns:
+        Median pitch (int for odd lengths, float for even lengths).
+    """
+    counts = [0] * 128
+    for pitch in pitches:
+        counts[pitch] += 1
+    total = len(pitches)
+    low_rank = (total - 1) // 2
+    high_rank = total // 2
+    low_pitch = None
+    seen = 0
+    for pitch, count in enumerate(counts):
+        seen += count
+        if low_pitch is None and seen > low_rank:
+            low_pitch = pitch
+        if seen > high_rank:
+            if total % 2:
+                return pitch
+            return (low_pitch + pitch) / 2
+    raise ValueError("pitch_median() arg is an empty sequence")
+
+
 def _edit_distance(seq_a: list, seq_b: list) -> int:
     """Levenshtein edit distance between two sequences.
 
     Standard dynamic programming implementation. Works with any
-    comparable elements (ints, strings, etc.).
+    comparable elements (ints, strings, etc.). A shared prefix and
+    suffix never change the distance, so they are trimmed before the
+    quadratic table is filled.
 
     Args:
         seq_a: First sequence.
@@ -45,6 +111,19 @@ def _edit_distance(seq_a: list, seq_b: list) -> int:
     len_a = len(seq_a)
     len_b = len(seq_b)
 
+    # Trim common prefix and suffix (identical motifs finish here)
+    prefix = 0
+    while prefix < len_a and prefix < len_b and seq_a[prefix] == seq_b[prefix]:
+        prefix += 1
+    while (len_a > prefix and len_b > prefix
+           and seq_a[len_a - 1] == seq_b[len_b - 1]):
+        len_a -= 1
+        len_b -= 1
+    seq_a = seq_a[prefix:len_a]
+    seq_b = seq_b[prefix:len_b]
+    len_a -= prefix
+    len_b -= prefix
+
     # Handle empty sequences
     if len_a == 0:
         return len_b
@@ -55,15 +134,19 @@ def _edit_distance(seq_a: list, seq_b: list) -> int:
     prev_row = list(range(len_b + 1))
     curr_row = [0] * (len_b + 1)
 
-    for idx_a in range(1, len_a + 1):
-        curr_row[0] = idx_a
-        for idx_b in range(1, len_b + 1):
-            cost = 0 if seq_a[idx_a - 1] == seq_b[idx_b - 1] else 1
-            curr_row[idx_b] = min(
-                prev_row[idx_b] + 1,       # deletion
-                curr_row[idx_b - 1] + 1,    # insertion
-                prev_row[idx_b - 1] + cost  # substitution
-            )
+    for idx_a, elem_a in enumerate(seq_a, 1):
+        curr_row[0] = left = idx_a
+        for idx_b, elem_b in enumerate(seq_b, 1):
+            diag = prev_row[idx_b - 1]
+            if elem_a != elem_b:
+                diag += 1                  # substitution
+            up = prev_row[idx_b] + 1       # deletion
+            left += 1                      # insertion
+            if up < left:
+                left = up
+            if diag < left:
+                left = diag
+            curr_row[idx_b] = left
         prev_row, curr_row = curr_row, prev_row
 
     return prev_row[len_b]
@@ -89,6 +172,16 @@ def _pattern_similarity(pat_a: list, pat_b: list) -> float:
     return 1.0 - dist / max_len
 
 
+@lru_cache(maxsize=4096)
+def _cached_pattern_similarity(pat_a: tuple, pat_b: tuple) -> float:
+    """Memoized ``_pattern_similarity`` for hashable (tuple) patterns.
+
+    Repeated motifs produce the same interval/IOI patterns many times, so
+    pairwise comparisons across sections hit the cache often.
+    """
+    return _pattern_similarity(pat_a, pat_b)
+
+
 def contour_direction_changes(pitches: list) -> int:
     """Count number of direction changes in a pitch sequence.
 
@@ -103,20 +196,23 @@ def contour_direction_changes(pitches: list) -> int:
     """
     if len(pitches) < 3:
         return 0
-    changes = 0
-    prev_dir = 0
-    for i in range(1, len(pitches)):
-        diff = pitches[i] - pitches[i - 1]
-        if diff > 0:
-            cur_dir = 1
-        elif diff < 0:
-            cur_dir = -1
-        else:
-            continue
-        if prev_dir != 0 and cur_dir != prev_dir:
-            changes += 1
-        prev_dir = cur_dir
-    return changes
+    return interval_direction_changes(list(map(sub, pitches[1:], pitches)))
+
+
+def interval_direction_changes(intervals) -> int:
+    """Count direction changes in a sequence of pitch intervals.
+
+    Same count as ``contour_direction_changes`` for callers that already
+    hold the intervals. Repeated pitches (zero intervals) are skipped.
+
+    Args:
+        intervals: Signed pitch intervals between consecutive notes.
+
+    Returns:
+        Number of switches between ascending and descending motion.
+    """
+    rising = [interval > 0 for interval in intervals if interval]
+    return sum(map(ne, rising[1:], rising))
 
 
 def quantize_rhythm(ioi_list: list, grid: int = 120) -> list:
@@ -131,7 +227,19 @@ def quantize_rhythm(ioi_list: list, grid: int = 120) -> list:
     """
     if not ioi_list:
         return []
-    return [max(grid, round(ioi / grid) * grid) for ioi in ioi_list]
+    # IOIs repeat heavily within a track: quantize each distinct value once.
+    table = {ioi: max(grid, round(ioi / grid) * grid) for ioi in set(ioi_list)}
+    return list(map(table.__getitem__, ioi_list))
+
+
+@lru_cache(maxsize=256)
+def _cached_quantize_rhythm(ioi_tuple: tuple, grid: int = 120) -> tuple:
+    """Memoized ``quantize_rhythm`` for hashable (tuple) IOI patterns.
+
+    Bar-span windows of a repetitive vocal line share the same IOIs, so
+    the quantized pattern is computed once per distinct rhythm.
+    """
+    return tuple(quantize_rhythm(ioi_tuple, grid))
 
 
 def _ioi_entropy(ioi_list: list) -> float:
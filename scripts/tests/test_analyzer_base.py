@@ -0,0 +1,188 @@
+"""Tests for shared BaseAnalyzer helpers: cached aggregates and range lookups."""
+
+import unittest
+from collections import defaultdict
+
+from conftest import Note, TICKS_PER_BAR, TICKS_PER_BEAT
+from music_analyzer.analyzers import AnalysisContext, BaseAnalyzer
+
+
+def _make_analyzer(notes):
+    """Build a BaseAnalyzer the way MusicAnalyzer does (sorted, grouped)."""
+    notes = sorted(notes, key=lambda n: (n.start, n.channel))
+    by_channel = defaultdict(list)
+    for note in notes:
+        by_channel[note.channel].append(note)
+    return BaseAnalyzer(notes, by_channel)
+
+
+class TestBaseAnalyzerAggregates(unittest.TestCase):
+    """Test lazily cached per-song aggregates."""
+
+    def test_max_tick_and_bar(self):
+        """max_tick is the latest note end, max_bar the last onset bar."""
+        analyzer = _make_analyzer([
+            Note(start=0, duration=TICKS_PER_BAR * 3, pitch=60, velocity=80, channel=1),
+            Note(start=TICKS_PER_BAR, duration=TICKS_PER_BEAT, pitch=64, velocity=80, channel=0),
+        ])
+        self.assertEqual(analyzer.max_tick, TICKS_PER_BAR * 3)
+        self.assertEqual(analyzer.max_bar, 2)
+
+    def test_empty_song(self):
+        """Aggregates default to zero without notes."""
+        analyzer = _make_analyzer([])
+        self.assertEqual(analyzer.max_tick, 0)
+        self.assertEqual(analyzer.max_bar, 0)
+        self.assertEqual(analyzer.sections, [])
+
+    def test_sections_carry_tick_windows(self):
+        """Estimated sections expose their half-open tick window."""
+        analyzer = _make_analyzer([
+            Note(start=bar * TICKS_PER_BAR, duration=TICKS_PER_BEAT,
+                 pitch=60, velocity=80, channel=0)
+            for bar in range(10)
+        ])
+        for sec in analyzer.sections:
+            self.assertEqual(sec['start_tick'], (sec['start_bar'] - 1) * TICKS_PER_BAR)
+            self.assertEqual(sec['end_tick'], sec['end_bar'] * TICKS_PER_BAR)
+
+    def test_section_classification_thirds(self):
+        """Densest third becomes chorus, sparsest third verse, rest bridge."""
+        bar_notes = {0: 1, 1: 4, 2: 2, 3: 1, 4: 4, 5: 2}  # section -> notes/bar
+        notes = [
+            Note(start=(sec * 8 + bar) * TICKS_PER_BAR + idx * TICKS_PER_BEAT,
+                 duration=TICKS_PER_BEAT, pitch=60, velocity=80, channel=0)
+            for sec, per_bar in bar_notes.items()
+            for bar in range(8)
+            for idx in range(per_bar)
+        ]
+        types = [sec['type'] for sec in _make_analyzer(notes).sections]
+        self.assertEqual(types, ['verse', 'chorus', 'bridge', 'verse', 'chorus', 'bridge'])
+
+    def test_columns_align_with_channel_notes(self):
+        """Column lists mirror notes_by_channel order."""
+        notes = [
+            Note(start=tick, duration=120, pitch=60 + idx, velocity=70 + idx, channel=3)
+            for idx, tick in enumerate((0, 240, 480))
+        ]
+        analyzer = _make_analyzer(notes)
+        cols = analyzer.columns[3]
+        self.assertEqual(cols['start'], [0, 240, 480])
+        self.assertEqual(cols['end'], [120, 360, 600])
+        self.assertEqual(cols['pitch'], [60, 61, 62])
+        self.assertEqual(cols['velocity'], [70, 71, 72])
+
+    def test_bar_attack_masks(self):
+        """Attack offsets are grouped per 1-indexed bar as bitmasks."""
+        analyzer = _make_analyzer([
+            Note(start=0, duration=120, pitch=60, velocity=80, channel=3),
+            Note(start=240, duration=120, pitch=62, velocity=80, channel=3),
+            Note(start=TICKS_PER_BAR + 5, duration=120, pitch=64, velocity=80, channel=3),
+        ])
+        masks = analyzer.bar_attack_masks(3)
+        self.assertEqual(masks, {1: (1 << 0) | (1 << 240), 2: 1 << 5})
+        self.assertIs(analyzer.bar_attack_masks(3), masks)
+        self.assertEqual(analyzer.bar_attack_masks(0), {})
+
+
+class TestAnalysisContext(unittest.TestCase):
+    """Test song-level caches shared through an AnalysisContext."""
+
+    def test_shared_context_derives_once(self):
+        """Analyzers over one context reuse the same cached objects."""
+        base = _make_analyzer([
+            Note(start=bar * TICKS_PER_BAR, duration=TICKS_PER_BEAT,
+                 pitch=60, velocity=80, channel=0)
+            for bar in range(16)
+        ])
+        context = AnalysisContext()
+        first = BaseAnalyzer(base.notes, base.notes_by_channel, context=context)
+        second = BaseAnalyzer(base.notes, base.notes_by_channel, context=context)
+        self.assertIs(first.sections, second.sections)
+        self.assertIs(first.columns, second.columns)
+        self.assertEqual(second.max_bar, 16)
+
+    def test_default_context_is_private(self):
+        """Analyzers built without a context do not share caches."""
+        notes = [Note(start=0, duration=TICKS_PER_BEAT, pitch=60, velocity=80, channel=0)]
+        first = _make_analyzer(notes)
+        second = _make_analyzer(notes)
+        self.assertIsNot(first.context, second.context)
+
+
+class TestBaseAnalyzerRanges(unittest.TestCase):
+    """Test binary-searched note range lookups."""
+
+    def setUp(self):
+        self.analyzer = _make_analyzer([
+            Note(start=beat * TICKS_PER_BEAT, duration=TICKS_PER_BEAT,
+                 pitch=60, velocity=80, channel=0)
+            for beat in range(8)
+        ])
+
+    def test_half_open_range(self):
+        """Range includes notes starting at start_tick, excludes end_tick."""
+        notes = self.analyzer.notes_in_range(0, TICKS_PER_BEAT, TICKS_PER_BAR)
+        self.assertEqual([n.start for n in notes], [480, 960, 1440])
+
+    def test_index_range_counts(self):
+        """Index range width equals the number of matching notes."""
+        lo, hi = self.analyzer.note_index_range(0, 0, TICKS_PER_BAR * 2)
+        self.assertEqual(hi - lo, 8)
+
+    def test_missing_channel(self):
+        """Channels without notes yield an empty range."""
+        self.assertEqual(self.analyzer.note_index_range(5, 0, TICKS_PER_BAR), (0, 0))
+        self.assertEqual(self.analyzer.notes_in_range(5, 0, TICKS_PER_BAR), [])
+
+    def test_beat_strength(self):
+        """Beat strength follows the beat within the bar, offsets ignored."""
+        strengths = [
+            self.analyzer.get_beat_strength(TICKS_PER_BAR + beat * TICKS_PER_BEAT + 10)
+            for beat in range(4)
+        ]
+        self.assertEqual(strengths, [1.0, 0.4, 0.7, 0.4])
+
+
+class TestChordDegreeLookup(unittest.TestCase):
+    """Test bisect-based provenance chord-degree lookup."""
+
+    def setUp(self):
+        notes = []
+        for tick, degree in ((0, 0), (TICKS_PER_BAR, 4), (TICKS_PER_BAR * 2, 3)):
+            note = Note(start=tick, duration=TICKS_PER_BAR, pitch=48, velocity=80, channel=1)
+            note.provenance = {'chord_degree': degree}
+            notes.append(note)
+        notes.append(Note(start=TICKS_PER_BEAT, duration=120, pitch=60, velocity=80, channel=0))
+        self.analyzer = _make_analyzer(notes)
+
+    def test_nearest_onset(self):
+        """Closest provenance onset supplies the degree."""
+        self.assertEqual(self.analyzer.get_chord_degree_at(TICKS_PER_BAR), 4)
+        self.assertEqual(self.analyzer.get_chord_degree_at(TICKS_PER_BAR - 10), 4)
+        self.assertEqual(self.analyzer.get_chord_degree_at(TICKS_PER_BAR * 9), 3)
+
+    def test_tie_prefers_earlier_onset(self):
+        """Equidistant onsets resolve to the earlier one."""
+        self.assertEqual(self.analyzer.get_chord_degree_at(TICKS_PER_BAR // 2), 0)
+
+    def test_max_distance_is_exclusive(self):
+        """Onsets at or beyond max_distance are ignored."""
+        tick = TICKS_PER_BAR * 2 + TICKS_PER_BEAT
+        self.assertEqual(
+            self.analyzer.get_chord_degree_at(tick, max_distance=TICKS_PER_BEAT), -1
+        )
+        self.assertEqual(
+            self.analyzer.get_chord_degree_at(tick, max_distance=TICKS_PER_BEAT + 1), 3
+        )
+
+    def test_no_provenance(self):
+        """Songs without provenance return -1."""
+        analyzer = _make_analyzer([
+            Note(start=0, duration=120, pitch=60, velocity=80, channel=0),
+        ])
+        self.assertEqual(analyzer.get_chord_degree_at(0), -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,8 @@
 
 import unittest
 
-from conftest import Note, MusicAnalyzer, TICKS_PER_BAR, TICKS_PER_BEAT
+from conftest import Note, MusicAnalyzer, Severity, TICKS_PER_BAR, TICKS_PER_BEAT
+from music_analyzer.analyzers.arrangement import _active_notes_per_beat, _pitch_class_roll
 
 
 def _make_note(channel, start, duration, pitch, velocity=80):
@@ -194,6 +195,58 @@ class TestSubmelodyVocalCrossing(unittest.TestCase):
         issues = self._get_crossing_issues(notes)
         self.assertEqual(len(issues), 0)
 
+    def test_long_song_persistent_crossing(self):
+        """Very long songs still detect a persistent crossing on every beat."""
+        notes = []
+        total_beats = 600
+        for beat in range(total_beats):
+            tick = beat * TICKS_PER_BEAT
+            notes.append(_make_note(0, tick, TICKS_PER_BEAT, 65))
+            notes.append(_make_note(5, tick, TICKS_PER_BEAT, 72))
+
+        issues = self._get_crossing_issues(notes)
+
+        above = [iss for iss in issues if "sounds above" in iss.message]
+        self.assertEqual(len(above), 1)
+        self.assertEqual(above[0].details["crossing_ratio"], 1.0)
+
+    def _alternating_submelody_issues(self, beat_in_cycle):
+        """Analyze a 300-beat song whose Motif/Aux play on some beats of a cycle."""
+        cycle = max(beat_in_cycle) + 1
+        notes = []
+        for beat in range(300):
+            tick = beat * TICKS_PER_BEAT
+            notes.append(_make_note(0, tick, TICKS_PER_BEAT, 67))
+            if beat % cycle in beat_in_cycle:
+                notes.append(_make_note(3, tick, TICKS_PER_BEAT, 65))
+                notes.append(_make_note(5, tick, TICKS_PER_BEAT, 72))
+        return MusicAnalyzer(notes).analyze_all().issues
+
+    def test_long_song_alternating_beat_submelodies(self):
+        """Sub-melodies on only some beats of a long song are still seen."""
+        # Odd beats only, and beats 2-3 of every 4.
+        for beat_in_cycle in ({1}, {1, 2}):
+            with self.subTest(beat_in_cycle=beat_in_cycle):
+                issues = self._alternating_submelody_issues(beat_in_cycle)
+
+                overlap = [
+                    iss for iss in issues
+                    if iss.subcategory == "register_overlap"
+                    and iss.track == "Vocal/Motif"
+                ]
+                self.assertEqual(len(overlap), 1)
+                self.assertEqual(overlap[0].severity, Severity.WARNING)
+                self.assertEqual(overlap[0].details["overlap_ratio"], 1.0)
+
+                above = [
+                    iss for iss in issues
+                    if iss.subcategory == "submelody_vocal_crossing"
+                    and iss.message.startswith("Aux sounds above")
+                ]
+                self.assertEqual(len(above), 1)
+                self.assertEqual(above[0].severity, Severity.WARNING)
+                self.assertEqual(above[0].details["crossing_ratio"], 1.0)
+
     def test_non_overlapping_beats_not_counted(self):
         """Notes that do not overlap in time should not count as crossings."""
         notes = []
@@ -214,5 +267,234 @@ class TestSubmelodyVocalCrossing(unittest.TestCase):
         self.assertEqual(len(above_issues), 0)
 
 
+class TestBlueprintRhythmSync(unittest.TestCase):
+    """Test _analyze_blueprint_rhythm_sync attack-position matching."""
+
+    def _get_sync_issues(self, notes):
+        """Run analysis under IdolHyper (RhythmSync) and return rhythm_sync issues."""
+        result = MusicAnalyzer(notes, blueprint=5).analyze_all()
+        return [iss for iss in result.issues if iss.subcategory == "rhythm_sync"]
+
+    def test_shared_attacks_no_issue(self):
+        """Motif attacking with the vocal in every bar should not be flagged."""
+        notes = []
+        for bar in range(8):
+            for beat in range(4):
+                tick = bar * TICKS_PER_BAR + beat * TICKS_PER_BEAT
+                notes.append(_make_note(0, tick, TICKS_PER_BEAT, 67))
+                notes.append(_make_note(3, tick, TICKS_PER_BEAT, 60))
+
+        self.assertEqual(self._get_sync_issues(notes), [])
+
+    def test_offbeat_attacks_warning(self):
+        """Motif attacking only between vocal onsets should produce WARNING."""
+        notes = []
+        half_beat = TICKS_PER_BEAT // 2
+        for bar in range(8):
+            for beat in range(4):
+                tick = bar * TICKS_PER_BAR + beat * TICKS_PER_BEAT
+                notes.append(_make_note(0, tick, half_beat, 67))
+                notes.append(_make_note(3, tick + half_beat, half_beat, 60))
+
+        issues = self._get_sync_issues(notes)
+        self.assertEqual(len(issues), 1)
+        self.assertEqual(issues[0].severity.value, "warning")
+        self.assertEqual(issues[0].details["sync_ratio"], 0.0)
+
+    def test_attack_correlation_partial_overlap(self):
+        """Correlation averages per-bar Jaccard of attack positions."""
+        notes = []
+        half_beat = TICKS_PER_BEAT // 2
+        for bar in range(4):
+            base = bar * TICKS_PER_BAR
+            # Vocal on beats 1-4, motif on beat 1 and three offbeats:
+            # shared 1, union 7 -> Jaccard 1/7 in every bar
+            for beat in range(4):
+                notes.append(_make_note(0, base + beat * TICKS_PER_BEAT, half_beat, 67))
+            for tick in (0, 720, 1200, 1680):
+                notes.append(_make_note(3, base + tick, half_beat, 60))
+
+        result = MusicAnalyzer(notes, blueprint=5).analyze_all()
+        issues = [
+            iss for iss in result.issues
+            if iss.subcategory == "blueprint_paradigm"
+            and iss.details.get("paradigm") == "RhythmSync"
+        ]
+        self.assertEqual(len(issues), 1)
+        self.assertEqual(issues[0].details["bars_checked"], 4)
+        self.assertAlmostEqual(issues[0].details["correlation"], 1 / 7)
+
+
+class TestBlueprintParadigmDensity(unittest.TestCase):
+    """Test _check_ballad_density under the Ballad blueprint."""
+
+    def _get_ballad_issues(self, notes):
+        result = MusicAnalyzer(notes, blueprint=3).analyze_all()
+        return [
+            iss for iss in result.issues
+            if iss.subcategory == "blueprint_paradigm"
+            and "avg_notes_per_bar" in iss.details
+        ]
+
+    def test_dense_ballad_flagged(self):
+        """Sixteenth-note vocal exceeds the Ballad density limit."""
+        sixteenth = TICKS_PER_BEAT // 4
+        notes = [
+            _make_note(0, idx * sixteenth, sixteenth, 67 + idx % 3)
+            for idx in range(64)
+        ]
+        issues = self._get_ballad_issues(notes)
+        self.assertEqual(len(issues), 1)
+        self.assertEqual(issues[0].details["avg_notes_per_bar"], 16.0)
+
+    def test_sparse_ballad_not_flagged(self):
+        """Half-note vocal stays under the Ballad density limit."""
+        notes = [
+            _make_note(0, idx * TICKS_PER_BEAT * 2, TICKS_PER_BEAT * 2, 67)
+            for idx in range(16)
+        ]
+        self.assertEqual(self._get_ballad_issues(notes), [])
+
+
+class TestMotifVocalInterference(unittest.TestCase):
+    """Test _analyze_motif_vocal_interference overlap matching."""
+
+    def _get_clash_issues(self, notes):
+        """Run analysis and return only motif_vocal_clash issues."""
+        result = MusicAnalyzer(notes).analyze_all()
+        return [iss for iss in result.issues if iss.subcategory == "motif_vocal_clash"]
+
+    def test_minor_second_clash_warning(self):
+        """Motif a semitone above every vocal note should produce WARNING."""
+        notes = []
+        for beat in range(8):
+            tick = beat * TICKS_PER_BEAT
+            notes.append(_make_note(0, tick, TICKS_PER_BEAT, 64))
+            notes.append(_make_note(3, tick, TICKS_PER_BEAT, 65))
+
+        issues = self._get_clash_issues(notes)
+        self.assertEqual(len(issues), 1)
+        self.assertEqual(issues[0].severity.value, "warning")
+        self.assertEqual(issues[0].details["clash_count"], 8)
+
+    def test_short_note_after_long_note_not_overlapping(self):
+        """A short motif note after a long one only matches vocal it overlaps."""
+        notes = [
+            # Long motif note spanning two vocal notes (octave: consonant)
+            _make_note(3, 0, TICKS_PER_BAR, 52),
+            _make_note(0, 0, TICKS_PER_BEAT, 64),
+            _make_note(0, TICKS_PER_BAR - TICKS_PER_BEAT, TICKS_PER_BEAT, 64),
+        ]
+        # Short motif notes ending before the second vocal note starts
+        for tick in (480, 720, 960):
+            notes.append(_make_note(3, tick, 60, 65))
+        # Consonant overlaps so enough overlaps are counted
+        for beat in range(4, 8):
+            tick = beat * TICKS_PER_BEAT
+            notes.append(_make_note(0, tick, TICKS_PER_BEAT, 64))
+            notes.append(_make_note(3, tick, TICKS_PER_BEAT, 60))
+
+        self.assertEqual(self._get_clash_issues(notes), [])
+
+
+class TestMotifDensityBalance(unittest.TestCase):
+    """Test _analyze_motif_density_balance per-bar note counting."""
+
+    def _get_balance_issues(self, notes):
+        """Run analysis and return only motif_density_balance issues."""
+        result = MusicAnalyzer(notes).analyze_all()
+        return [iss for iss in result.issues if iss.subcategory == "motif_density_balance"]
+
+    def test_both_dense_flagged(self):
+        """Vocal and motif both with 4+ notes in every bar are flagged."""
+        notes = []
+        for bar in range(6):
+            for beat in range(4):
+                tick = bar * TICKS_PER_BAR + beat * TICKS_PER_BEAT
+                notes.append(_make_note(0, tick, TICKS_PER_BEAT, 72))
+                notes.append(_make_note(3, tick, TICKS_PER_BEAT, 55))
+
+        issues = self._get_balance_issues(notes)
+        self.assertEqual(len(issues), 1)
+        self.assertEqual(issues[0].details["both_dense_bars"], 6)
+        self.assertEqual(issues[0].details["overlap_bars"], 6)
+
+    def test_alternating_bars_not_flagged(self):
+        """Motif filling only the bars where the vocal rests is fine."""
+        notes = []
+        for bar in range(8):
+            channel, pitch = (0, 72) if bar % 2 == 0 else (3, 55)
+            for beat in range(4):
+                tick = bar * TICKS_PER_BAR + beat * TICKS_PER_BEAT
+                notes.append(_make_note(channel, tick, TICKS_PER_BEAT, pitch))
+
+        self.assertEqual(self._get_balance_issues(notes), [])
+
+
+class TestActiveNotesSweep(unittest.TestCase):
+    """Test the start/end event sweep behind the per-beat overlap checks."""
+
+    def test_matches_brute_force(self):
+        """Sweep yields exactly the notes sounding at each sampled beat."""
+        notes = sorted([
+            _make_note(3, 0, TICKS_PER_BAR * 2, 60),
+            _make_note(3, 0, TICKS_PER_BEAT // 2, 64),
+            _make_note(3, TICKS_PER_BEAT, TICKS_PER_BEAT, 67),
+            _make_note(3, TICKS_PER_BEAT * 3 + 10, 50, 72),
+            _make_note(3, TICKS_PER_BAR, TICKS_PER_BEAT * 3, 65),
+        ], key=lambda n: n.start)
+        max_tick = TICKS_PER_BAR * 2
+        expected = [
+            [n for n in notes if n.start <= tick < n.end]
+            for tick in range(0, max_tick, TICKS_PER_BEAT)
+        ]
+        self.assertEqual(list(_active_notes_per_beat(notes, max_tick)), expected)
+
+    def test_unchanged_membership_reuses_list(self):
+        """Beats with the same sounding notes share one list object."""
+        notes = [_make_note(3, 0, TICKS_PER_BAR, 60)]
+        beats = list(_active_notes_per_beat(notes, TICKS_PER_BAR))
+        self.assertEqual(len(beats), 4)
+        self.assertTrue(all(active is beats[0] for active in beats))
+
+    def test_pitch_class_roll(self):
+        """Roll folds sounding pitches to pitch-class masks, 0 when silent."""
+        notes = [
+            _make_note(6, 0, TICKS_PER_BEAT * 2, 48),
+            _make_note(6, 0, TICKS_PER_BEAT, 64),
+            _make_note(6, TICKS_PER_BEAT * 3, TICKS_PER_BEAT, 60),
+        ]
+        roll = _pitch_class_roll(notes, TICKS_PER_BAR)
+        self.assertEqual(roll, [(1 << 0) | (1 << 4), 1 << 0, 0, 1 << 0])
+
+
+class TestRegisterOverlap(unittest.TestCase):
+    """Test _analyze_register_overlap close-pitch detection."""
+
+    def _get_overlap_issues(self, notes):
+        """Run analysis and return only register_overlap issues."""
+        result = MusicAnalyzer(notes).analyze_all()
+        return [iss for iss in result.issues if iss.subcategory == "register_overlap"]
+
+    def _vocal_and_motif(self, vocal_pitch, motif_pitch):
+        notes = []
+        for beat in range(8):
+            tick = beat * TICKS_PER_BEAT
+            notes.append(_make_note(0, tick, TICKS_PER_BEAT, vocal_pitch))
+            notes.append(_make_note(3, tick, TICKS_PER_BEAT, motif_pitch))
+        return notes
+
+    def test_close_pitches_flagged(self):
+        """Motif a minor third below the vocal on every beat is flagged."""
+        issues = self._get_overlap_issues(self._vocal_and_motif(67, 64))
+        self.assertEqual(len(issues), 1)
+        self.assertEqual(issues[0].details["overlap_ratio"], 1.0)
+
+    def test_unison_and_wide_intervals_ignored(self):
+        """Unisons and intervals wider than 3 semitones are not overlap."""
+        self.assertEqual(self._get_overlap_issues(self._vocal_and_motif(67, 67)), [])
+        self.assertEqual(self._get_overlap_issues(self._vocal_and_motif(67, 63)), [])
+
+
 if __name__ == "__main__":
     unittest.main()
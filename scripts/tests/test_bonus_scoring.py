@@ -11,6 +11,7 @@ from conftest import Note, MusicAnalyzer, TICKS_PER_BAR, TICKS_PER_BEAT
 from music_analyzer.models import Bonus, QualityScore
 from music_analyzer.constants import Category
 from music_analyzer.blueprints import BLUEPRINT_PROFILES
+from music_analyzer.analyzers.bonus_melodic import BonusMelodicAnalyzer
 
 
 def _make_song(bars=32, with_patterns=True):
@@ -256,5 +257,141 @@ class TestBonusCaps(unittest.TestCase):
         )
 
 
+def _melodic_analyzer(vocal_notes):
+    """Build a BonusMelodicAnalyzer over vocal (ch 0) notes only."""
+    return BonusMelodicAnalyzer(vocal_notes, {0: vocal_notes})
+
+
+class TestEarwormPotential(unittest.TestCase):
+    """Test _score_earworm_potential exact/approximate bar matching."""
+
+    def _bars(self, bar_pitches):
+        """One bar per pitch list, notes evenly spaced within the bar."""
+        notes = []
+        for bar_idx, pitches in enumerate(bar_pitches):
+            spacing = TICKS_PER_BAR // len(pitches)
+            for note_idx, pitch in enumerate(pitches):
+                notes.append(Note(
+                    start=bar_idx * TICKS_PER_BAR + note_idx * spacing,
+                    duration=spacing // 2, pitch=pitch, velocity=80, channel=0,
+                ))
+        return notes
+
+    def test_transposed_repeats_and_near_match(self):
+        """Exact pairs come from transposed repeats; near matches weight by count."""
+        bar_pitches = [
+            [60, 61, 62, 63, 62],  # A: intervals (1, 1, 1, -1), range 3
+            [62, 63, 64, 65, 64],  # A transposed +2
+            [65, 66, 67, 68, 67],  # A transposed +5
+            [60, 61, 62, 63, 72],  # N: (1, 1, 1, 9), 3 of 4 intervals match A
+            [64, 65, 66, 67, 76],  # N transposed +4
+            [60, 55, 67, 62, 74],  # unrelated
+            [70, 69, 68, 67, 66],  # unrelated
+        ]
+        analyzer = _melodic_analyzer(self._bars(bar_pitches))
+        analyzer._score_earworm_potential(analyzer.notes_by_channel[0])
+
+        self.assertEqual(len(analyzer.bonuses), 1)
+        bonus = analyzer.bonuses[0]
+        # 21 bar pairs: exact = A (3 pairs) + N (1 pair) = 4, approximate
+        # = every A/N pair = 3 * 2 = 6, so approx_rate = (4 + 6) / 21.
+        # Repeated bars are A and N only: mean range (3 * 3 + 2 * 12) / 5
+        # = 6.6 semitones, inside the 5-12 sweet spot.
+        self.assertEqual(
+            bonus.description, "exact_rate=0.19 approx_rate=0.48 range=1.00"
+        )
+        expected = (1.0 * 0.4 + min(1.0, 10 / 21 * 2.0) * 0.3 + 1.0 * 0.3) * 4.0
+        self.assertAlmostEqual(bonus.score, round(expected, 2))
+
+    def test_without_near_match_range_uses_exact_repeats_only(self):
+        """Bars with no exact or approximate partner stay out of the range check."""
+        bar_pitches = [
+            [60, 61, 62, 63, 62],
+            [62, 63, 64, 65, 64],
+            [65, 66, 67, 68, 67],
+            [60, 55, 67, 62, 74],
+            [70, 69, 68, 67, 66],
+        ]
+        analyzer = _melodic_analyzer(self._bars(bar_pitches))
+        analyzer._score_earworm_potential(analyzer.notes_by_channel[0])
+
+        # 10 pairs, 3 exact; only the A bars (range 3) feed the range score.
+        self.assertEqual(
+            analyzer.bonuses[0].description,
+            "exact_rate=0.30 approx_rate=0.30 range=0.60",
+        )
+
+
+class TestMelodicSequences(unittest.TestCase):
+    """Test _score_melodic_sequences matching rules."""
+
+    def _sequence_bonuses(self, pitches):
+        """Run the sequence check over one note per beat."""
+        notes = [
+            Note(start=idx * TICKS_PER_BEAT, duration=TICKS_PER_BEAT // 2,
+                 pitch=pitch, velocity=80, channel=0)
+            for idx, pitch in enumerate(pitches)
+        ]
+        analyzer = _melodic_analyzer(notes)
+        analyzer._score_melodic_sequences()
+        return analyzer.bonuses
+
+    def test_sequence_at_different_pitch_counts(self):
+        """Interval pattern (2, 2, -1, 3) restated a fourth higher counts."""
+        bonuses = self._sequence_bonuses(
+            [60, 62, 64, 63, 66, 65, 67, 69, 68, 71]
+        )
+        self.assertEqual(len(bonuses), 1)
+        self.assertEqual(bonuses[0].description, "detected 1 sequence(s)")
+
+    def test_matched_window_not_reused(self):
+        """A window already paired is not paired again with a later restatement."""
+        # Three statements of (2, 2, -1, 3); the middle one pairs with the
+        # first, so the third has no unmatched partner left.
+        bonuses = self._sequence_bonuses(
+            [60, 62, 64, 63, 66, 80, 82, 84, 83, 86, 40, 42, 44, 43, 46]
+        )
+        self.assertEqual(bonuses[0].description, "detected 1 sequence(s)")
+
+    def test_exact_repeat_at_same_pitch_ignored(self):
+        """The same fragment at the same pitch is a repeat, not a sequence."""
+        bonuses = self._sequence_bonuses(
+            [60, 62, 64, 63, 66, 60, 62, 64, 63, 66]
+        )
+        self.assertEqual(bonuses, [])
+
+    def test_overlapping_repeat_ignored(self):
+        """A matching window that overlaps the first one is not a sequence."""
+        # Windows at intervals 0 and 2 share (2, -1, 2, -1) but overlap.
+        bonuses = self._sequence_bonuses([60, 62, 61, 63, 62, 64, 63])
+        self.assertEqual(bonuses, [])
+
+
+class TestPhraseDetection(unittest.TestCase):
+    """Test _detect_phrases gap-based phrase boundaries."""
+
+    def test_gap_measured_from_previous_note_end(self):
+        """Boundaries use the previous note's end, not the phrase's latest end."""
+        notes = [
+            # Phrase 1: a held bar-long note under two short notes.
+            Note(start=0, duration=TICKS_PER_BAR, pitch=60, velocity=80, channel=0),
+            Note(start=240, duration=240, pitch=64, velocity=80, channel=0),
+            Note(start=600, duration=240, pitch=67, velocity=80, channel=0),
+            # Phrase 2 starts 660 ticks after the short note ends, although
+            # the held note is still sounding.
+            Note(start=1500, duration=300, pitch=65, velocity=80, channel=0),
+            Note(start=1900, duration=200, pitch=64, velocity=80, channel=0),
+            # Phrase 3 starts exactly one beat after phrase 2 ends.
+            Note(start=2100 + TICKS_PER_BEAT, duration=TICKS_PER_BEAT,
+                 pitch=62, velocity=80, channel=0),
+        ]
+        analyzer = _melodic_analyzer(notes)
+
+        # Phrase 1 runs to the held note's end; phrase 2 from 1500 to 2100.
+        self.assertEqual(
+            analyzer._detect_phrases(), [TICKS_PER_BAR, 600, TICKS_PER_BEAT]
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
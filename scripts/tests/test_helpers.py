@@ -1,8 +1,13 @@
-"""Tests for helper functions (note_name, tick_to_bar)."""
+"""Tests for helper functions (note_name, tick_to_bar, pattern similarity)."""
 
 import unittest
 
 from conftest import note_name, tick_to_bar
+from music_analyzer.helpers import (
+    pitch_class_mask, pitch_mask, pitch_median, _edit_distance,
+    _pattern_similarity, _cached_pattern_similarity,
+    contour_direction_changes, interval_direction_changes, quantize_rhythm,
+)
 
 
 class TestNoteHelpers(unittest.TestCase):
@@ -20,6 +25,64 @@ class TestNoteHelpers(unittest.TestCase):
         self.assertEqual(tick_to_bar(1920), 2)
         self.assertEqual(tick_to_bar(3840), 3)
 
+    def test_pitch_class_mask(self):
+        self.assertEqual(pitch_class_mask([60, 64, 67]), 0b000010010001)
+        self.assertEqual(pitch_class_mask([48, 60, 72]), pitch_class_mask([36]))
+        self.assertEqual(pitch_class_mask([]), 0)
+
+    def test_pitch_mask(self):
+        self.assertEqual(pitch_mask([0, 3]), 0b1001)
+        self.assertEqual(pitch_mask([127]), 1 << 127)
+        self.assertEqual(pitch_mask([60, 60]), pitch_mask([60]))
+        self.assertEqual(pitch_mask([]), 0)
+
+    def test_pitch_median(self):
+        self.assertEqual(pitch_median([72, 60, 65]), 65)
+        self.assertEqual(pitch_median([60, 72, 60, 72]), 66.0)
+        self.assertEqual(pitch_median([64]), 64)
+
+    def test_contour_direction_changes(self):
+        self.assertEqual(contour_direction_changes([60, 62, 60, 62]), 2)
+        # Repeated pitches do not break or add a direction run.
+        self.assertEqual(contour_direction_changes([60, 62, 62, 64, 60]), 1)
+        self.assertEqual(contour_direction_changes([60, 62]), 0)
+        self.assertEqual(interval_direction_changes((2, 0, -2, 0, 3)), 2)
+        self.assertEqual(interval_direction_changes(()), 0)
+
+    def test_quantize_rhythm(self):
+        self.assertEqual(
+            quantize_rhythm([480, 470, 250, 30, 480]),
+            [480, 480, 240, 120, 480],
+        )
+        self.assertEqual(quantize_rhythm([]), [])
+
+
+class TestPatternSimilarity(unittest.TestCase):
+    """Test edit-distance pattern similarity and its memoized variant."""
+
+    def test_cached_matches_uncached(self):
+        pairs = [
+            ((1, -1, 0, 2), (1, -1, 0, 2)),
+            ((1, -1, 0, 2), (1, 1, 0)),
+            ((2, 2, 4), ()),
+        ]
+        for pat_a, pat_b in pairs:
+            self.assertEqual(
+                _cached_pattern_similarity(pat_a, pat_b),
+                _pattern_similarity(list(pat_a), list(pat_b)),
+            )
+
+    def test_edit_distance(self):
+        self.assertEqual(_edit_distance([1, 2, 3], [1, 2, 3]), 0)
+        self.assertEqual(_edit_distance([1, 2, 3], [1, 5, 3]), 1)
+        self.assertEqual(_edit_distance([0, 1, 2, 3, 0], [0, 3, 2, 1, 0]), 2)
+        self.assertEqual(_edit_distance([2, 2], [2, 2, 2, 2]), 2)
+        self.assertEqual(_edit_distance((), (1, 2)), 2)
+        self.assertEqual(_edit_distance("kitten", "sitting"), 3)
+
+    def test_cached_identical_is_one(self):
+        self.assertEqual(_cached_pattern_similarity((1, 0, -1), (1, 0, -1)), 1.0)
+
 
 if __name__ == "__main__":
     unittest.main()